@@ -11,4 +11,4 @@ class CoreConfig(AppConfig):
         Código que se ejecuta cuando Django inicia.
         Útil para importar signals o registrar handlers.
         """
-        pass
\ No newline at end of file
+        from core import signals  # noqa: F401
\ No newline at end of file
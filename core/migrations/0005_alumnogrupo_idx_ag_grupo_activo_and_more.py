@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-08-28 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_rename_fecha_completado_fecha_fin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alumnogrupo',
+            index=models.Index(fields=['grupo', 'activo'], name='idx_ag_grupo_activo'),
+        ),
+        migrations.AddIndex(
+            model_name='grupo',
+            index=models.Index(fields=['periodo', 'activo'], name='idx_grupo_periodo_activo'),
+        ),
+    ]
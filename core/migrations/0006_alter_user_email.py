@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-08-28 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_alumnogrupo_idx_ag_grupo_activo_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(blank=True, db_index=True, max_length=254, verbose_name='Correo Electrónico'),
+        ),
+    ]
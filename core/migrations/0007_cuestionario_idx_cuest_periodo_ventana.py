@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-08-28 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_alter_user_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cuestionario',
+            index=models.Index(fields=['periodo', 'activo', 'fecha_inicio', 'fecha_fin'], name='idx_cuest_periodo_ventana'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-08-28 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_cuestionario_idx_cuest_periodo_ventana'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='alumnogrupo',
+            name='idx_ag_grupo_activo',
+        ),
+        migrations.AddIndex(
+            model_name='alumnogrupo',
+            index=models.Index(fields=['grupo', 'activo', 'alumno'], name='idx_ag_grupo_activo'),
+        ),
+    ]
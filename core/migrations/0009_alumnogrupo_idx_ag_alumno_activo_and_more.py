@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-08-28 01:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_remove_alumnogrupo_idx_ag_grupo_activo_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alumnogrupo',
+            index=models.Index(fields=['alumno', 'activo', 'grupo'], name='idx_ag_alumno_activo'),
+        ),
+        migrations.AddIndex(
+            model_name='respuesta',
+            index=models.Index(fields=['alumno', 'cuestionario', 'pregunta'], name='idx_resp_alumno_cuest_preg'),
+        ),
+    ]
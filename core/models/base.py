@@ -4,6 +4,7 @@ Modelo de Usuario Extendido
 """
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils.functional import cached_property
 
 
 class User(AbstractUser):
@@ -24,6 +25,14 @@ class User(AbstractUser):
         ('Otro', 'Otro'),
     ]
     
+    # Redeclarado sobre AbstractUser para indexarlo: password-reset busca
+    # por email y sin índice es un table scan. No se marca unique porque
+    # los datos importados pueden traer correos repetidos
+    email = models.EmailField(
+        blank=True,
+        db_index=True,
+        verbose_name='Correo Electrónico'
+    )
     rol = models.CharField(
         max_length=10,
         choices=ROL_CHOICES,
@@ -61,8 +70,13 @@ class User(AbstractUser):
         verbose_name = 'Usuario'
         verbose_name_plural = 'Usuarios'
     
+    @cached_property
+    def display_name(self):
+        """Nombre para mostrar; se memoiza por instancia para accesos repetidos."""
+        return self.nombre_completo or f"{self.first_name} {self.last_name}".strip()
+
     def __str__(self):
-        return self.nombre_completo or self.get_full_name() or self.username
+        return self.display_name or self.username
     
     def save(self, *args, **kwargs):
         # Auto-llenar nombre_completo si está vacío
@@ -51,6 +51,10 @@ class Grupo(models.Model):
         verbose_name = 'Grupo'
         verbose_name_plural = 'Grupos'
         ordering = ['clave']
+        indexes = [
+            # Activar/desactivar periodo filtra por (periodo_id, activo)
+            models.Index(fields=['periodo', 'activo'], name='idx_grupo_periodo_activo'),
+        ]
     
     def __str__(self):
         return f"{self.clave} ({self.periodo.codigo})"
@@ -91,6 +95,15 @@ class AlumnoGrupo(models.Model):
         unique_together = ['alumno', 'grupo']
         verbose_name = 'Alumno-Grupo'
         verbose_name_plural = 'Alumnos-Grupos'
+        indexes = [
+            # Cascadas de periodo y validacion de respuestas filtran por
+            # (grupo_id, activo); incluir alumno lo vuelve covering para
+            # el values_list('alumno_id') del responder
+            models.Index(fields=['grupo', 'activo', 'alumno'], name='idx_ag_grupo_activo'),
+            # Acceso del alumno a cuestionarios: filtra por (alumno, activo)
+            # y resuelve el grupo desde el propio indice
+            models.Index(fields=['alumno', 'activo', 'grupo'], name='idx_ag_alumno_activo'),
+        ]
     
     def __str__(self):
         return f"{self.alumno.matricula} → {self.grupo.clave}"
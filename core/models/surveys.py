@@ -107,16 +107,28 @@ class Cuestionario(models.Model):
         verbose_name = 'Cuestionario'
         verbose_name_plural = 'Cuestionarios'
         ordering = ['-creado_en']
+        indexes = [
+            # Cubre el listado de disponibles: periodo + activo + ventana
+            models.Index(
+                fields=['periodo', 'activo', 'fecha_inicio', 'fecha_fin'],
+                name='idx_cuest_periodo_ventana'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.titulo} - {self.periodo.nombre}"
     
+    def esta_activo_en(self, at=None):
+        """Verificar si está en periodo de aplicación en el instante dado"""
+        if at is None:
+            from django.utils import timezone
+            at = timezone.now()
+        return self.activo and self.fecha_inicio <= at <= self.fecha_fin
+
     @property
     def esta_activo(self):
         """Verificar si está en periodo de aplicación"""
-        from django.utils import timezone
-        now = timezone.now()
-        return self.activo and self.fecha_inicio <= now <= self.fecha_fin
+        return self.esta_activo_en()
     
     @property
     def total_respuestas(self):
@@ -281,6 +293,14 @@ class Respuesta(models.Model):
         unique_together = [['alumno', 'pregunta', 'seleccionado_alumno']]
         verbose_name = 'Respuesta'
         verbose_name_plural = 'Respuestas'
+        indexes = [
+            # Camino caliente de responder/progreso: filtra por
+            # (alumno, cuestionario) y agrupa/borra por pregunta
+            models.Index(
+                fields=['alumno', 'cuestionario', 'pregunta'],
+                name='idx_resp_alumno_cuest_preg'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.alumno.matricula} - Pregunta {self.pregunta.orden}"
@@ -0,0 +1,27 @@
+# core/renderers.py
+"""
+Renderers personalizados para DRF
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer sobre orjson en lugar del json de la stdlib.
+
+    orjson serializa en C y regresa bytes directamente (sin el paso
+    str -> encode), lo que acelera respuestas anidadas como las de
+    login y /me/. `default=str` cubre Decimal, date, datetime y UUID
+    con el mismo formato que producía el encoder de DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=str, option=option)
@@ -39,6 +39,7 @@ from .cuestionario import (
     CuestionarioPreguntaSerializer,
     CuestionarioEstadoSerializer,
     AgregarPreguntaSerializer,
+    ResponderCuestionarioSerializer,
     ProgresoAlumnoSerializer,
 )
 
@@ -91,6 +92,7 @@ __all__ = [
     'CuestionarioPreguntaSerializer',
     'CuestionarioEstadoSerializer',
     'AgregarPreguntaSerializer',
+    'ResponderCuestionarioSerializer',
     'ProgresoAlumnoSerializer',
     
     # Catálogos
@@ -42,10 +42,25 @@ class CuestionarioPreguntaSerializer(serializers.ModelSerializer):
 class CuestionarioListSerializer(serializers.ModelSerializer):
     periodo_codigo = serializers.CharField(source='periodo.codigo', read_only=True)
     periodo_nombre = serializers.CharField(source='periodo.nombre', read_only=True)
-    total_preguntas = serializers.IntegerField(read_only=True)
-    total_respuestas = serializers.IntegerField(read_only=True)
-    total_grupos = serializers.IntegerField(read_only=True)
+    # Los totales prefieren las anotaciones n_* si el queryset las trae
+    # (un solo SQL para todo el listado); sin anotar caen a las
+    # properties del modelo (un COUNT por fila)
+    total_preguntas = serializers.SerializerMethodField()
+    total_respuestas = serializers.SerializerMethodField()
+    total_grupos = serializers.SerializerMethodField()
     esta_activo = serializers.BooleanField(read_only=True)
+
+    def get_total_preguntas(self, obj):
+        n = getattr(obj, 'n_preguntas', None)
+        return obj.total_preguntas if n is None else n
+
+    def get_total_respuestas(self, obj):
+        n = getattr(obj, 'n_respuestas', None)
+        return obj.total_respuestas if n is None else n
+
+    def get_total_grupos(self, obj):
+        n = getattr(obj, 'n_grupos', None)
+        return obj.total_grupos if n is None else n
     
     class Meta:
         model = Cuestionario
@@ -54,7 +69,8 @@ class CuestionarioListSerializer(serializers.ModelSerializer):
             'fecha_inicio', 'fecha_fin', 'activo', 'esta_activo',
             'total_preguntas', 'total_respuestas', 'total_grupos', 'creado_en'
         ]
-        read_only_fields = ['id', 'creado_en']
+        # Serializer de solo lectura: sin maquinaria de validacion por campo
+        read_only_fields = fields
 
 
 class CuestionarioDetailSerializer(serializers.ModelSerializer):
@@ -69,12 +85,13 @@ class CuestionarioDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Cuestionario
         fields = [
-            'id', 'titulo', 'descripcion', 'periodo', 'periodo_codigo', 
+            'id', 'titulo', 'descripcion', 'periodo', 'periodo_codigo',
             'periodo_nombre', 'fecha_inicio', 'fecha_fin', 'activo',
-            'esta_activo', 'preguntas', 'total_preguntas', 
+            'esta_activo', 'preguntas', 'total_preguntas',
             'total_respuestas', 'total_grupos', 'creado_en'
         ]
-        read_only_fields = ['id', 'creado_en']
+        # Solo se usa para respuestas — nunca deserializa
+        read_only_fields = fields
 
 
 class CuestionarioEstadoSerializer(serializers.ModelSerializer):
@@ -347,14 +364,114 @@ class RespuestaCreateSerializer(serializers.Serializer):
         return data
 
 
+def _validar_pregunta(pregunta, resp_data, alumno_id, alumnos_grupo_ids):
+    """
+    Valida una respuesta individual contra su pregunta.
+
+    Regresa el primer error encontrado como str, o None si es valida.
+    Los accesos al payload se hacen una sola vez y se reutilizan en
+    todas las comprobaciones.
+    """
+    if pregunta.tipo == 'SELECCION_ALUMNO':
+        seleccionados = resp_data.get('seleccionados', [])
+
+        # Validacion: exactamente max_elecciones
+        if len(seleccionados) != pregunta.max_elecciones:
+            return (
+                f'Debes seleccionar exactamente {pregunta.max_elecciones} '
+                f'companero(s). Enviaste {len(seleccionados)}.'
+            )
+
+        alumno_ids_enviados = [sel.get('alumno_id') for sel in seleccionados]
+        ids_enviados_set = set(alumno_ids_enviados)
+
+        # Validacion: no autovoto
+        if alumno_id in ids_enviados_set:
+            return 'No puedes votarte a ti mismo'
+
+        # Validacion: todos los destinos pertenecen al grupo
+        ids_fuera_de_grupo = ids_enviados_set - alumnos_grupo_ids
+        if ids_fuera_de_grupo:
+            return f'Los siguientes alumnos no pertenecen a tu grupo: {list(ids_fuera_de_grupo)}'
+
+        # Validacion: sin duplicados en destinos
+        if len(alumno_ids_enviados) != len(ids_enviados_set):
+            return 'No puedes seleccionar al mismo companero dos veces en la misma pregunta'
+
+        # Validacion: ordenes unicos
+        ordenes_enviados = [sel.get('orden') for sel in seleccionados]
+        if len(ordenes_enviados) != len(set(ordenes_enviados)):
+            return 'No puedes asignar el mismo orden a dos companeros distintos'
+
+    elif pregunta.tipo == 'OPCION':
+        if not resp_data.get('opcion_id'):
+            return 'Debe seleccionar una opcion'
+
+    elif pregunta.tipo == 'TEXTO':
+        if not resp_data.get('texto_respuesta', '').strip():
+            return 'Debe proporcionar una respuesta de texto'
+
+    return None
+
+
+class ResponderCuestionarioSerializer(serializers.Serializer):
+    """
+    Valida el payload completo de responder_cuestionario_view en una pasada.
+
+    Requiere en context:
+      - alumno_id: ID del alumno que responde
+      - alumnos_grupo_ids: IDs validos del grupo (sin el alumno actual)
+      - preguntas_cuestionario: dict {pregunta_id: Pregunta} del cuestionario
+
+    Los errores se acumulan por pregunta con la misma forma que expone la
+    vista: [{'pregunta_id': ..., 'error': ...}].
+    """
+    respuestas = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False
+    )
+
+    def validate(self, data):
+        alumno_id = self.context['alumno_id']
+        alumnos_grupo_ids = self.context['alumnos_grupo_ids']
+        preguntas_cuestionario = self.context['preguntas_cuestionario']
+
+        errores = []
+
+        for resp_data in data['respuestas']:
+            pregunta_id = resp_data.get('pregunta_id')
+
+            # Pregunta existe y pertenece al cuestionario
+            pregunta = preguntas_cuestionario.get(pregunta_id)
+            if pregunta is None:
+                errores.append({
+                    'pregunta_id': pregunta_id,
+                    'error': 'Esta pregunta no pertenece al cuestionario'
+                })
+                continue
+
+            error = _validar_pregunta(pregunta, resp_data, alumno_id, alumnos_grupo_ids)
+            if error is not None:
+                errores.append({'pregunta_id': pregunta_id, 'error': error})
+
+        if errores:
+            # DRF convierte cada hoja del detalle en ErrorDetail (pregunta_id
+            # pasaria de int a str); se conserva la lista cruda para que la
+            # vista responda con exactamente la misma forma que antes
+            self.errores_crudos = errores
+            raise serializers.ValidationError({'errores': errores})
+
+        return data
+
+
 class ProgresoAlumnoSerializer(serializers.Serializer):
-    cuestionario_id = serializers.IntegerField()
-    cuestionario_titulo = serializers.CharField()
-    grupo_id = serializers.IntegerField()
-    grupo_clave = serializers.CharField()
-    total_preguntas = serializers.IntegerField()
-    preguntas_respondidas = serializers.IntegerField()
-    progreso = serializers.DecimalField(max_digits=5, decimal_places=2)
-    estado = serializers.CharField()
-    fecha_inicio = serializers.DateTimeField(allow_null=True)
-    fecha_fin = serializers.DateTimeField(allow_null=True)
\ No newline at end of file
+    cuestionario_id = serializers.IntegerField(read_only=True)
+    cuestionario_titulo = serializers.CharField(read_only=True)
+    grupo_id = serializers.IntegerField(read_only=True)
+    grupo_clave = serializers.CharField(read_only=True)
+    total_preguntas = serializers.IntegerField(read_only=True)
+    preguntas_respondidas = serializers.IntegerField(read_only=True)
+    progreso = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    estado = serializers.CharField(read_only=True)
+    fecha_inicio = serializers.DateTimeField(allow_null=True, read_only=True)
+    fecha_fin = serializers.DateTimeField(allow_null=True, read_only=True)
\ No newline at end of file
@@ -0,0 +1,26 @@
+# core/signals.py
+"""
+Receivers de invalidacion de cache
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import AlumnoGrupo, Cuestionario, CuestionarioPregunta
+from core.utils.survey_cache import (
+    invalidar_cuestionario, invalidar_grupo, invalidar_periodo
+)
+
+
+@receiver([post_save, post_delete], sender=CuestionarioPregunta)
+def invalidar_skeleton_por_pregunta(sender, instance, **kwargs):
+    invalidar_cuestionario(instance.cuestionario_id)
+
+
+@receiver([post_save, post_delete], sender=Cuestionario)
+def invalidar_disponibles_por_cuestionario(sender, instance, **kwargs):
+    invalidar_periodo(instance.periodo_id)
+
+
+@receiver([post_save, post_delete], sender=AlumnoGrupo)
+def invalidar_skeleton_por_roster(sender, instance, **kwargs):
+    invalidar_grupo(instance.grupo_id)
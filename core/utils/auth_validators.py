@@ -35,8 +35,10 @@ def validate_user_active_status(user):
     """
     if user.rol == 'ALUMNO':
         try:
-            alumno = Alumno.objects.get(user=user)
-            
+            # Acceso por el reverse OneToOne: reutiliza el cache de select_related
+            # si el caller ya trajo el perfil junto con el user (p.ej. login_view)
+            alumno = user.alumno
+
             # Validar estatus del alumno
             if alumno.estatus == 'BAJA':
                 return False, Response(
@@ -88,8 +90,8 @@ def validate_user_active_status(user):
     
     elif user.rol == 'DOCENTE':
         try:
-            docente = Docente.objects.get(user=user)
-            
+            docente = user.docente
+
             # Validar estatus del docente
             if docente.estatus == 'INACTIVO':
                 return False, Response(
@@ -141,7 +143,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             'id': self.user.id,
             'username': self.user.username,
             'email': self.user.email,
-            'nombre_completo': self.user.nombre_completo or self.user.get_full_name(), 
+            'nombre_completo': self.user.display_name,
             'rol': self.user.rol,  
             'genero': self.user.genero,  
             'is_staff': self.user.is_staff,
@@ -1,5 +1,6 @@
 # core/utils/decorators.py
 from functools import wraps
+from django.core.cache import cache
 from rest_framework.response import Response
 from rest_framework import status
 from core.models import AlumnoGrupo
@@ -411,4 +412,53 @@ def require_comite_readonly(view_func):
             )
 
         return view_func(request, *args, **kwargs)
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+def ratelimit(scope, rate=20, period=60):
+    """
+    Decorador de rate limit por IP usando el cache de Django.
+
+    Rechaza con 429 antes de ejecutar la vista — en endpoints AllowAny esto
+    corta el costo del hash de contraseña / firma JWT en intentos abusivos.
+
+    Args:
+        scope (str): Nombre del contador (p.ej. 'login')
+        rate (int): Máximo de requests permitidos por ventana
+        period (int): Ventana en segundos
+
+    Uso:
+        @api_view(['POST'])
+        @permission_classes([AllowAny])
+        @ratelimit('login', rate=20, period=60)
+        def login_view(request):
+            # ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+            if forwarded:
+                ip = forwarded.split(',')[0].strip()
+            else:
+                ip = request.META.get('REMOTE_ADDR', '')
+
+            key = f'rl:{scope}:{ip}'
+
+            # add() + incr() es atómico por clave en backends tipo Redis/memcached
+            cache.add(key, 0, period)
+            try:
+                count = cache.incr(key)
+            except ValueError:
+                # La clave expiró entre add() e incr()
+                cache.set(key, 1, period)
+                count = 1
+
+            if count > rate:
+                return Response(
+                    {'error': 'Demasiadas solicitudes. Intenta de nuevo más tarde.'},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,4 +1,6 @@
 # core/utils/email.py
+from concurrent.futures import ThreadPoolExecutor
+
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
@@ -6,6 +8,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Pool pequeño para envíos fire-and-forget: la respuesta HTTP no debe
+# esperar el RTT del servidor SMTP
+_email_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='email')
+
 
 def send_password_reset_email(user_email, reset_token, user_name=None):
     """
@@ -66,4 +72,16 @@ def send_password_reset_email(user_email, reset_token, user_name=None):
         
     except Exception as e:
         logger.error(f"Error al enviar correo a {user_email}: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+
+def send_password_reset_email_async(user_email, reset_token, user_name=None):
+    """
+    Versión fire-and-forget de send_password_reset_email.
+
+    Encola el envío en un pool de hilos y regresa de inmediato; los errores
+    de SMTP quedan registrados en el log por la función síncrona. Seguro para
+    el flujo de reset porque la respuesta al cliente es la misma exista o no
+    el correo.
+    """
+    _email_executor.submit(send_password_reset_email, user_email, reset_token, user_name)
\ No newline at end of file
@@ -0,0 +1,18 @@
+# core/utils/hashers.py
+"""
+Hashers de contraseña del proyecto
+"""
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id con parámetros de RFC 9106 (perfil de memoria baja).
+
+    Frente al PBKDF2 por defecto, la dureza de memoria de Argon2 permite un
+    tiempo de verificación menor en logins legítimos con resistencia
+    equivalente o mayor ante ataques por GPU/ASIC.
+    """
+    time_cost = 2
+    memory_cost = 65536  # 64 MiB
+    parallelism = 2
@@ -5,6 +5,7 @@ Funciones auxiliares para importación de datos desde Excel
 import re
 import pandas as pd
 from datetime import date
+from functools import lru_cache
 from django.db.models import Count, Q
 from core.models import (
     Division, Programa, PlanEstudio, Periodo, 
@@ -12,6 +13,10 @@ from core.models import (
 )
 
 
+# Patrón precompilado: quita el sufijo de año ("... - 2020") de un nombre
+_RE_ANIO_SUFIJO = re.compile(r'\s*-\s*\d{4}')
+
+
 def limpiar_texto(texto):
     """Limpia y normaliza texto de Excel"""
     if pd.isna(texto) or texto == '':
@@ -19,6 +24,44 @@ def limpiar_texto(texto):
     return str(texto).strip()
 
 
+def limpiar_columna(series):
+    """Versión vectorizada de limpiar_texto para una columna completa"""
+    stripped = series.astype('string').str.strip()
+    return stripped.astype(object).where(stripped.notna() & (stripped != ''), None)
+
+
+def limpiar_columnas(df, columnas):
+    """Aplica limpiar_columna a las columnas indicadas que existan en el DataFrame"""
+    for col in columnas:
+        if col in df.columns:
+            df[col] = limpiar_columna(df[col])
+
+
+def clave_grupo(programa_nombre, cuatrimestre_str, grupo_clave):
+    """
+    Clave normalizada del cache de grupos
+
+    Grupos e inscritos provienen de hojas distintas: normalizar a minúsculas
+    en ambos lados evita que diferencias de mayúsculas inflen los
+    'grupos no encontrados'.
+    """
+    return (
+        programa_nombre.lower() if programa_nombre else programa_nombre,
+        str(cuatrimestre_str).lower() if cuatrimestre_str else cuatrimestre_str,
+        grupo_clave.lower() if grupo_clave else grupo_clave,
+    )
+
+
+def deduplicar_hoja(df, subset):
+    """Elimina filas duplicadas según las columnas del subset que existan"""
+    columnas = [col for col in subset if col in df.columns]
+    if not columnas or df.empty:
+        return df
+    return df.drop_duplicates(subset=columnas)
+
+
+# Memoizado: cada importador lo invoca dos veces por matrícula o empleado
+@lru_cache(maxsize=8192)
 def generar_username(matricula_o_empleado):
     """Genera username a partir de matrícula o número de empleado"""
     return str(matricula_o_empleado).strip().lower().replace(' ', '')
@@ -42,6 +85,26 @@ def normalizar_genero(sexo):
     return None
 
 
+def normalizar_genero_columna(series):
+    """Versión vectorizada de normalizar_genero para una columna completa"""
+    sexo = series.astype('string').str.strip().str.lower()
+    resultado = pd.Series([None] * len(series), index=series.index, dtype=object)
+    es_femenino = (
+        sexo.str.contains('f', na=False)
+        | sexo.str.contains('mujer', na=False)
+    )
+    es_masculino = (
+        sexo.str.contains('h', na=False)
+        | (sexo == 'm')
+        | sexo.str.contains('masculino', na=False)
+    )
+    # Masculino se asigna al final para replicar la precedencia del
+    # if/elif de normalizar_genero
+    resultado[es_femenino] = 'Femenino'
+    resultado[es_masculino] = 'Masculino'
+    return resultado
+
+
 def validar_estructura_excel(excel_file):
     """
     Valida que el archivo Excel tenga la estructura correcta
@@ -208,11 +271,34 @@ def sugerir_periodo(periodos_data):
     }
 
 
+# El dominio (anio, numero) es pequeño y el resultado es determinista,
+# por lo que estos generadores se memoizan a nivel de proceso.
+@lru_cache(maxsize=None)
+def generar_codigo_programa(nombre):
+    """Genera código corto de programa a partir de su nombre"""
+    nombre_limpio = _RE_ANIO_SUFIJO.sub('', nombre)
+    palabras = nombre_limpio.split()
+
+    if len(palabras) >= 3:
+        codigo = ''.join([p[0].upper() for p in palabras if len(p) > 2])[:8]
+    elif len(palabras) == 2:
+        codigo = ''.join([p[:4].upper() for p in palabras])[:8]
+    else:
+        codigo = ''.join([c.upper() for c in nombre_limpio if c.isalnum()])[:8]
+
+    if not codigo or len(codigo) < 2:
+        codigo = nombre_limpio.replace(' ', '')[:20].upper()
+
+    return codigo
+
+
+@lru_cache(maxsize=None)
 def generar_codigo_periodo(anio, numero):
     """Genera código de periodo según convención UTP"""
     return f"{anio}-{numero}"
 
 
+@lru_cache(maxsize=None)
 def generar_nombre_periodo(anio, numero):
     """Genera nombre de periodo según convención UTP"""
     nombres = {
@@ -223,6 +309,7 @@ def generar_nombre_periodo(anio, numero):
     return nombres.get(numero, f"Periodo {anio}-{numero}")
 
 
+@lru_cache(maxsize=None)
 def generar_fechas_periodo(anio, numero):
     """
     Genera fechas de inicio y fin según el periodo
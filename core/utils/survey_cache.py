@@ -0,0 +1,60 @@
+# core/utils/survey_cache.py
+"""
+Cache del esqueleto de preguntas/companeros por (cuestionario, grupo)
+
+Toda la clase carga el mismo formulario en la misma ventana: las consultas
+de preguntas y de roster son identicas por alumno y cambian rara vez. El
+esqueleto (sin ya_respondida, que es por alumno) se cachea con claves
+versionadas: invalidar es incrementar la version, sin borrar por patron.
+"""
+from django.core.cache import cache
+
+# TTL del esqueleto — acota el dano de una invalidacion perdida
+SKELETON_TTL = 600
+
+# TTL corto del listado de disponibles: todo el cohorte del periodo ve la
+# misma lista y los totales pueden tolerar hasta un minuto de atraso
+DISPONIBLES_TTL = 60
+
+
+def _version(key):
+    # timeout None = la version no expira
+    if cache.add(key, 1, None):
+        return 1
+    return cache.get(key, 1)
+
+
+def _incrementar(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def skeleton_cache_key(cuestionario_id, grupo_id):
+    version_cuest = _version(f'cuest_ver:{cuestionario_id}')
+    version_grupo = f'grupo_ver:{grupo_id}'
+    return (
+        f'cuest:{cuestionario_id}.{version_cuest}'
+        f':grupo:{grupo_id}.{_version(version_grupo)}:skeleton'
+    )
+
+
+def invalidar_cuestionario(cuestionario_id):
+    """Invalida esqueletos tras cambios en las preguntas del cuestionario"""
+    _incrementar(f'cuest_ver:{cuestionario_id}')
+
+
+def invalidar_grupo(grupo_id):
+    """Invalida esqueletos tras cambios en el roster del grupo"""
+    _incrementar(f'grupo_ver:{grupo_id}')
+
+
+def disponibles_cache_key(periodo_id, fecha):
+    version = _version(f'periodo_cuest_ver:{periodo_id}')
+    return f'cuest:disponibles:{periodo_id}.{version}:{fecha.isoformat()}'
+
+
+def invalidar_periodo(periodo_id):
+    """Invalida el listado de disponibles tras cambios en cuestionarios"""
+    _incrementar(f'periodo_cuest_ver:{periodo_id}')
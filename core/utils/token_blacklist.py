@@ -0,0 +1,31 @@
+# core/utils/token_blacklist.py
+"""
+Capa de cache frente al blacklist de tokens JWT
+
+La fuente de verdad sigue siendo la app token_blacklist de simplejwt (BD),
+pero las verificaciones calientes (logout repetido, reuso de token de reset)
+se resuelven primero contra el cache de Django — en producción un backend
+compartido tipo Redis — sin tocar disco.
+"""
+from django.core.cache import cache
+
+_BLACKLIST_KEY_PREFIX = 'jwt_bl'
+
+# TTL por defecto si el token no trae exp utilizable (1 hora, igual que
+# la vigencia de los tokens de reset)
+DEFAULT_TTL = 3600
+
+
+def _key(jti):
+    return f'{_BLACKLIST_KEY_PREFIX}:{jti}'
+
+
+def marcar_token_usado(jti, ttl=DEFAULT_TTL):
+    """Marca un jti como usado/blacklisteado por el tiempo de vida restante"""
+    if ttl and ttl > 0:
+        cache.set(_key(jti), 1, ttl)
+
+
+def token_usado(jti):
+    """Fast-path: True si el jti ya fue marcado en cache (evita ir a la BD)"""
+    return cache.get(_key(jti)) is not None
@@ -19,6 +19,7 @@ import pandas as pd
 
 from core.utils.decorators import require_admin
 from core.utils.sync import sincronizar_is_active_alumnos
+from core.views.admin.periodos import _invalidar_cache_periodo_activo
 from core.models import (
     User, Division, Programa, PlanEstudio, Periodo,
     Docente, Grupo, Alumno, AlumnoGrupo, Auditoria
@@ -30,8 +31,12 @@ from core.utils.import_excel_helpers import (
     obtener_periodos_disponibles,
     sugerir_periodo,
     limpiar_texto,
+    limpiar_columnas,
+    deduplicar_hoja,
+    clave_grupo,
     generar_username,
-    normalizar_genero,
+    generar_codigo_programa,
+    normalizar_genero_columna,
     crear_periodo,
     calcular_estadisticas_cambios,
 )
@@ -40,6 +45,10 @@ from core.serializers.import_excel import (
     EjecucionImportacionSerializer
 )
 
+# Patrones precompilados: se aplican una vez por division/grupo importado
+_RE_NO_MAYUSCULAS = re.compile(r'[^A-Z]')
+_RE_GRADO = re.compile(r'^\d+')
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -244,16 +253,27 @@ def ejecutar_importacion_view(request):
         df_grupos = leer_hoja_excel(excel_file, hojas_map['grupos'])
         df_tutores = leer_hoja_excel(excel_file, hojas_map['tutores'])
         df_inscritos = leer_hoja_excel(excel_file, hojas_map['inscritos'])
-        
+
         excel_file.close()
         excel_file = None
-        
+
+        # Dedupe a nivel DataFrame (una pasada en C): evita que las filas
+        # repetidas del Excel lleguen a los loops de importacion
+        df_alumnos = deduplicar_hoja(df_alumnos, ['Matrícula'])
+        df_tutores = deduplicar_hoja(df_tutores, ['No. de empleado'])
+        df_grupos = deduplicar_hoja(df_grupos, ['Programa', 'Cuatrimestre', 'Grupo'])
+        df_inscritos = deduplicar_hoja(
+            df_inscritos, ['Matrícula', 'Programa', 'Cuatrimestre', 'Grupo']
+        )
+
         # Obtener o crear periodo
         if data.get('crear_periodo'):
+            # Se crea con activo=1: tambien cambia el periodo activo
             periodo = crear_periodo(
                 data['nuevo_periodo_anio'],
                 data['nuevo_periodo_numero']
             )
+            _invalidar_cache_periodo_activo()
         else:
             periodo = Periodo.objects.get(id=data['periodo_id'])
         
@@ -283,24 +303,40 @@ def ejecutar_importacion_view(request):
             # 1. DESACTIVAR PERIODOS ANTERIORES
             if data.get('desactivar_anteriores'):
                 log_messages.append("Desactivando periodos anteriores...")
-                
-                resultados['periodos_desactivados'] = Periodo.objects.exclude(
-                    id=periodo.id
-                ).filter(activo=1).update(activo=0)
-                
-                resultados['grupos_desactivados'] = Grupo.objects.filter(
-                    periodo__activo=0, 
-                    activo=1
-                ).update(activo=0)
-                
-                resultados['inscripciones_desactivadas'] = AlumnoGrupo.objects.filter(
-                    grupo__periodo__activo=0,
-                    activo=1
-                ).update(activo=0)
-                
-                # Activar periodo actual
-                Periodo.objects.filter(id=periodo.id).update(activo=1)
-                
+
+                # Ids resueltos una sola vez: los UPDATEs de grupos e
+                # inscripciones filtran por periodo_id__in en lugar de
+                # re-joinear periodo__activo=0 (que dependia del primer
+                # UPDATE y arrastraba periodos historicos ya inactivos)
+                periodos_a_desactivar = list(
+                    Periodo.objects.exclude(
+                        id=periodo.id
+                    ).filter(activo=1).values_list('id', flat=True)
+                )
+
+                if periodos_a_desactivar:
+                    resultados['periodos_desactivados'] = Periodo.objects.filter(
+                        id__in=periodos_a_desactivar
+                    ).update(activo=0)
+
+                    resultados['grupos_desactivados'] = Grupo.objects.filter(
+                        periodo_id__in=periodos_a_desactivar,
+                        activo=1
+                    ).update(activo=0)
+
+                    resultados['inscripciones_desactivadas'] = AlumnoGrupo.objects.filter(
+                        grupo__periodo_id__in=periodos_a_desactivar,
+                        activo=1
+                    ).update(activo=0)
+
+                # Activar periodo actual solo si hace falta — sin el write
+                # incondicional de re-activacion
+                Periodo.objects.filter(id=periodo.id, activo=0).update(activo=1)
+
+                # El periodo activo cambio: invalidar el cache que sirve
+                # obtener_periodo_activo_view
+                _invalidar_cache_periodo_activo()
+
                 log_messages.append(
                     f"✓ Desactivados: {resultados['periodos_desactivados']} periodos, "
                     f"{resultados['grupos_desactivados']} grupos, "
@@ -459,7 +495,7 @@ def importar_divisiones_programas(df_alumnos, df_grupos):
         if not div_nombre:
             continue
             
-        codigo = re.sub(r'[^A-Z]', '', div_nombre.upper())[:10]
+        codigo = _RE_NO_MAYUSCULAS.sub('', div_nombre.upper())[:10]
         if not codigo:
             codigo = div_nombre[:10].upper()
         
@@ -487,7 +523,20 @@ def importar_divisiones_programas(df_alumnos, df_grupos):
         p.nombre.strip().lower(): p
         for p in Programa.objects.all()
     }
-    
+
+    # Mapa Programa -> Division en una sola pasada sobre la hoja, en lugar
+    # de re-escanear el DataFrame por cada combinacion programa/division
+    prog_to_div = {}
+    if 'Programa' in df_alumnos.columns and 'División' in df_alumnos.columns:
+        pares = df_alumnos[['Programa', 'División']].dropna().drop_duplicates('Programa')
+        prog_to_div = {
+            limpiar_texto(prog): limpiar_texto(div)
+            for prog, div in zip(pares['Programa'], pares['División'])
+        }
+
+    # Division por defecto capturada una sola vez para el fallback
+    division_default = next(iter(divisiones_cache.values()), None)
+
     # Crear programas
     for prog_nombre in programas_unicos:
         prog_nombre = limpiar_texto(prog_nombre)
@@ -502,33 +551,15 @@ def importar_divisiones_programas(df_alumnos, df_grupos):
             programas_cache[prog_nombre] = programas_en_bd[prog_nombre_norm]
             continue
         
-        # Buscar división correspondiente
-        division = None
-        for div_nombre, div_obj in divisiones_cache.items():
-            mask_alumnos = (df_alumnos['Programa'] == prog_nombre) if 'Programa' in df_alumnos.columns else pd.Series([False] * len(df_alumnos))
-            if mask_alumnos.any():
-                div_alumno = df_alumnos.loc[mask_alumnos, 'División'].iloc[0]
-                if limpiar_texto(div_alumno) == div_nombre:
-                    division = div_obj
-                    break
-        
-        if not division and divisiones_cache:
-            division = list(divisiones_cache.values())[0]
-        
-        # Generar código
-        nombre_limpio = re.sub(r'\s*-\s*\d{4}', '', prog_nombre)
-        palabras = nombre_limpio.split()
-        
-        if len(palabras) >= 3:
-            codigo = ''.join([p[0].upper() for p in palabras if len(p) > 2])[:8]
-        elif len(palabras) == 2:
-            codigo = ''.join([p[:4].upper() for p in palabras])[:8]
-        else:
-            codigo = ''.join([c.upper() for c in nombre_limpio if c.isalnum()])[:8]
-        
-        if not codigo or len(codigo) < 2:
-            codigo = nombre_limpio.replace(' ', '')[:20].upper()
+        # Buscar división correspondiente en el mapa precalculado
+        division = divisiones_cache.get(prog_to_div.get(prog_nombre))
+
+        if not division:
+            division = division_default
         
+        # Generar código (memoizado a nivel de proceso)
+        codigo = generar_codigo_programa(prog_nombre)
+
         programa, created = Programa.objects.get_or_create(
             codigo=codigo,
             defaults={
@@ -556,6 +587,15 @@ def importar_tutores(df_tutores, divisiones_cache):
     tutores_cache = {}
     stats = {'creados': 0, 'errores': []}
 
+    # Limpieza vectorizada: una pasada en C por columna en lugar de
+    # limpiar_texto por celda dentro del loop
+    limpiar_columnas(df_tutores, [
+        'No. de empleado', 'Nombres', 'A. Paterno', 'A. Materno',
+        'Sexo', 'División', 'Puesto', 'Email'
+    ])
+    if 'Sexo' in df_tutores.columns:
+        df_tutores['_genero'] = normalizar_genero_columna(df_tutores['Sexo'])
+
     # Obtener IDs existentes de una sola vez
     empleados_existentes = set(
         Docente.objects.values_list('profesor_id', flat=True)
@@ -565,11 +605,15 @@ def importar_tutores(df_tutores, divisiones_cache):
         User.objects.filter(rol='DOCENTE').values_list('username', flat=True)
     )
 
+    # Una sola materializacion a dicts: iterrows construye una Series por
+    # fila y domina el costo del loop; ambas pasadas reutilizan la lista
+    registros_tutores = df_tutores.to_dict('records')
+
     # Precargar en un query los docentes del Excel que ya existen en BD
     empleados_en_excel = {
-        limpiar_texto(row.get('No. de empleado'))
-        for _, row in df_tutores.iterrows()
-        if limpiar_texto(row.get('No. de empleado'))
+        row.get('No. de empleado')
+        for row in registros_tutores
+        if row.get('No. de empleado')
     }
     docentes_existentes_dict = {
         d.profesor_id: d
@@ -583,14 +627,13 @@ def importar_tutores(df_tutores, divisiones_cache):
     docentes_to_create = []
 
     # Primera pasada: preparar users para crear
-    for idx, row in df_tutores.iterrows():
+    for idx, row in enumerate(registros_tutores):
         try:
-            empleado_id = limpiar_texto(row.get('No. de empleado'))
-            nombres = limpiar_texto(row.get('Nombres', ''))
-            a_paterno = limpiar_texto(row.get('A. Paterno', ''))
-            a_materno = limpiar_texto(row.get('A. Materno', ''))
-            sexo = limpiar_texto(row.get('Sexo', ''))
-            email = limpiar_texto(row.get('Email', ''))
+            empleado_id = row.get('No. de empleado')
+            nombres = row.get('Nombres')
+            a_paterno = row.get('A. Paterno')
+            a_materno = row.get('A. Materno')
+            email = row.get('Email')
 
             if not empleado_id or not nombres:
                 continue
@@ -602,9 +645,9 @@ def importar_tutores(df_tutores, divisiones_cache):
             
             apellidos = f"{a_paterno or ''} {a_materno or ''}".strip()
             nombre_completo = f"{nombres} {apellidos}".strip()
-            genero = normalizar_genero(sexo)
+            genero = row.get('_genero')
             username = generar_username(empleado_id)
-            
+
             # Si el user no existe, prepararlo para bulk create
             if username not in usernames_existentes:
                 user = User(
@@ -639,24 +682,26 @@ def importar_tutores(df_tutores, divisiones_cache):
             for u in User.objects.filter(username__in=usernames_nuevos)
         }
         
-        for idx, row in df_tutores.iterrows():
+        for idx, row in enumerate(registros_tutores):
             try:
-                empleado_id = limpiar_texto(row.get('No. de empleado'))
+                empleado_id = row.get('No. de empleado')
                 if not empleado_id or empleado_id in empleados_existentes:
                     continue
-                
+
                 username = generar_username(empleado_id)
                 if username not in users_dict:
                     continue
-                
-                division_nombre = limpiar_texto(row.get('División', ''))
-                puesto = limpiar_texto(row.get('Puesto', ''))
+
+                division_nombre = row.get('División')
+                puesto = row.get('Puesto')
                 division = divisiones_cache.get(division_nombre)
                 
+                # Asignar por *_id: los objetos ya estan en memoria y asi
+                # se evita el refresco de estado relacionado por fila
                 docente = Docente(
                     profesor_id=empleado_id,
-                    user=users_dict[username],
-                    division=division,
+                    user_id=users_dict[username].pk,
+                    division_id=division.pk if division else None,
                     es_tutor=True,
                     especialidad=puesto,
                     estatus='ACTIVO'
@@ -688,12 +733,20 @@ def importar_grupos(df_grupos, programas_cache, tutores_cache, periodo):
     grupos_cache = {}
     stats = {'creados': 0, 'errores': []}
 
+    # Limpieza vectorizada de las columnas usadas en el loop
+    limpiar_columnas(df_grupos, [
+        'Cuatrimestre', 'Grupo', 'Programa', 'Tutor Asignado', 'Turno'
+    ])
+
     # Preconstruir dict de búsqueda de tutores por nombre (evita O(n) lineal por grupo)
     tutores_por_nombre = {}
     for empleado_id, doc in tutores_cache.items():
         if hasattr(doc, 'id') and doc.id is not None:
             nombre = (doc.user.nombre_completo or doc.user.get_full_name()).lower()
             tutores_por_nombre[nombre] = doc
+    # Memo por nombre de tutor: los grupos repiten tutor y cada nombre
+    # distinto se resuelve con un solo scan del dict
+    tutores_resueltos = {}
 
     # Precargar grupos existentes del periodo en un solo query
     grupos_existentes = {
@@ -704,13 +757,13 @@ def importar_grupos(df_grupos, programas_cache, tutores_cache, periodo):
     grupos_to_create = []
     clave_to_cache_key = {}
 
-    for idx, row in df_grupos.iterrows():
+    for idx, row in enumerate(df_grupos.to_dict('records')):
         try:
-            cuatrimestre_str = limpiar_texto(row.get('Cuatrimestre'))
-            grupo_clave = limpiar_texto(row.get('Grupo'))
-            programa_nombre = limpiar_texto(row.get('Programa'))
-            tutor_nombre = limpiar_texto(row.get('Tutor Asignado', ''))
-            turno = limpiar_texto(row.get('Turno', 'Matutino'))
+            cuatrimestre_str = row.get('Cuatrimestre')
+            grupo_clave = row.get('Grupo')
+            programa_nombre = row.get('Programa')
+            tutor_nombre = row.get('Tutor Asignado')
+            turno = row.get('Turno', 'Matutino')
 
             if not grupo_clave or not programa_nombre:
                 continue
@@ -725,21 +778,25 @@ def importar_grupos(df_grupos, programas_cache, tutores_cache, periodo):
                 stats['errores'].append(f"Grupo fila {idx+2}: Programa no encontrado '{programa_nombre}'")
                 continue
 
-            # Buscar tutor en el dict preconstruido (O(n) una sola vez, no por grupo)
+            # Buscar tutor en el dict preconstruido, memoizando por nombre
             tutor = None
             if tutor_nombre:
                 tutor_nombre_lower = tutor_nombre.lower()
-                for nombre, doc in tutores_por_nombre.items():
-                    if tutor_nombre_lower in nombre:
-                        tutor = doc
-                        break
+                if tutor_nombre_lower in tutores_resueltos:
+                    tutor = tutores_resueltos[tutor_nombre_lower]
+                else:
+                    tutor = next(
+                        (doc for nombre, doc in tutores_por_nombre.items() if tutor_nombre_lower in nombre),
+                        None
+                    )
+                    tutores_resueltos[tutor_nombre_lower] = tutor
 
             # Extraer grado
-            grado_match = re.match(r'^\d+', str(cuatrimestre_str))
+            grado_match = _RE_GRADO.match(str(cuatrimestre_str))
             grado_final = grado_match.group(0) if grado_match else 'SG'
 
             clave_unica_bd = f"{programa.codigo}-{grado_final}-{grupo_clave}"
-            cache_key = (programa_nombre, cuatrimestre_str, grupo_clave)
+            cache_key = clave_grupo(programa_nombre, cuatrimestre_str, grupo_clave)
 
             if clave_unica_bd in grupos_existentes:
                 grupos_cache[cache_key] = grupos_existentes[clave_unica_bd]
@@ -747,12 +804,12 @@ def importar_grupos(df_grupos, programas_cache, tutores_cache, periodo):
 
             grupos_to_create.append(Grupo(
                 clave=clave_unica_bd,
-                periodo=periodo,
+                periodo_id=periodo.pk,
                 grado=grado_final,
                 grupo=grupo_clave,
                 turno=turno or 'Matutino',
-                programa=programa,
-                tutor=tutor,
+                programa_id=programa.pk,
+                tutor_id=tutor.pk if tutor else None,
                 activo=1,
                 cupo_maximo=40
             ))
@@ -782,6 +839,15 @@ def importar_alumnos(df_alumnos, programas_cache):
     alumnos_cache = {}
     stats = {'creados': 0, 'errores': []}
 
+    # Limpieza vectorizada: una pasada en C por columna en lugar de
+    # limpiar_texto por celda dentro del loop
+    limpiar_columnas(df_alumnos, [
+        'Matrícula', 'Nombres', 'A. Paterno', 'A. Materno', 'Sexo',
+        'NSS', 'Programa', 'Email', 'Email Institucional'
+    ])
+    if 'Sexo' in df_alumnos.columns:
+        df_alumnos['_genero'] = normalizar_genero_columna(df_alumnos['Sexo'])
+
     # Obtener matrículas existentes de una sola vez
     matriculas_existentes = set(
         Alumno.objects.values_list('matricula', flat=True)
@@ -791,11 +857,14 @@ def importar_alumnos(df_alumnos, programas_cache):
         User.objects.filter(rol='ALUMNO').values_list('username', flat=True)
     )
 
+    # Una sola materializacion a dicts para las dos pasadas del loop
+    registros_alumnos = df_alumnos.to_dict('records')
+
     # Precargar en un query los alumnos del Excel que ya existen en BD
     matriculas_en_excel = {
-        limpiar_texto(row.get('Matrícula'))
-        for _, row in df_alumnos.iterrows()
-        if limpiar_texto(row.get('Matrícula'))
+        row.get('Matrícula')
+        for row in registros_alumnos
+        if row.get('Matrícula')
     }
     alumnos_existentes_dict = {
         a.matricula: a
@@ -825,15 +894,14 @@ def importar_alumnos(df_alumnos, programas_cache):
             planes_cache[plan_codigo] = plan
     
     # Primera pasada: preparar users para crear
-    for idx, row in df_alumnos.iterrows():
+    for idx, row in enumerate(registros_alumnos):
         try:
-            matricula = limpiar_texto(row.get('Matrícula'))
-            nombres = limpiar_texto(row.get('Nombres', ''))
-            a_paterno = limpiar_texto(row.get('A. Paterno', ''))
-            a_materno = limpiar_texto(row.get('A. Materno', ''))
-            sexo = limpiar_texto(row.get('Sexo', ''))
-            email = limpiar_texto(row.get('Email Institucional') or row.get('Email', ''))
-            
+            matricula = row.get('Matrícula')
+            nombres = row.get('Nombres')
+            a_paterno = row.get('A. Paterno')
+            a_materno = row.get('A. Materno')
+            email = row.get('Email Institucional') or row.get('Email')
+
             if not matricula or not nombres:
                 continue
             
@@ -844,7 +912,7 @@ def importar_alumnos(df_alumnos, programas_cache):
             
             apellidos = f"{a_paterno or ''} {a_materno or ''}".strip()
             nombre_completo = f"{nombres} {apellidos}".strip()
-            genero = normalizar_genero(sexo)
+            genero = row.get('_genero')
             username = generar_username(matricula)
             
             # Si el user no existe, prepararlo para bulk create
@@ -880,18 +948,18 @@ def importar_alumnos(df_alumnos, programas_cache):
             for u in User.objects.filter(username__in=usernames_nuevos)
         }
         
-        for idx, row in df_alumnos.iterrows():
+        for idx, row in enumerate(registros_alumnos):
             try:
-                matricula = limpiar_texto(row.get('Matrícula'))
+                matricula = row.get('Matrícula')
                 if not matricula or matricula in matriculas_existentes:
                     continue
-                
+
                 username = generar_username(matricula)
                 if username not in users_dict:
                     continue
-                
-                nss = limpiar_texto(row.get('NSS', ''))
-                programa_nombre = limpiar_texto(row.get('Programa', ''))
+
+                nss = row.get('NSS')
+                programa_nombre = row.get('Programa')
                 programa = programas_cache.get(programa_nombre)
                 
                 plan_estudio = None
@@ -901,9 +969,9 @@ def importar_alumnos(df_alumnos, programas_cache):
                 
                 alumno = Alumno(
                     matricula=matricula,
-                    user=users_dict[username],
+                    user_id=users_dict[username].pk,
                     nss=nss,
-                    plan_estudio=plan_estudio,
+                    plan_estudio_id=plan_estudio.pk if plan_estudio else None,
                     semestre_actual=1,
                     estatus='ACTIVO'
                 )
@@ -938,6 +1006,11 @@ def importar_relaciones_inscritos(df_inscritos, alumnos_cache, grupos_cache):
     stats = {'creados': 0, 'errores': []}
     today = date.today()
 
+    # Limpieza vectorizada de las columnas usadas en el loop
+    limpiar_columnas(df_inscritos, [
+        'Matrícula', 'Grupo', 'Programa', 'Cuatrimestre'
+    ])
+
     # Obtener IDs de alumnos y grupos del cache
     alumnos_ids = [a.id for a in alumnos_cache.values() if hasattr(a, 'id')]
     grupos_ids = [g.id for g in grupos_cache.values() if hasattr(g, 'id')]
@@ -953,15 +1026,15 @@ def importar_relaciones_inscritos(df_inscritos, alumnos_cache, grupos_cache):
     # Lista para bulk create
     relaciones_to_create = []
     
-    for idx, row in df_inscritos.iterrows():
+    for idx, row in enumerate(df_inscritos.to_dict('records')):
         try:
-            matricula = limpiar_texto(row.get('Matrícula'))
-            grupo_clave = limpiar_texto(row.get('Grupo'))
-            programa_nombre = limpiar_texto(row.get('Programa'))
-            cuatrimestre_str = limpiar_texto(row.get('Cuatrimestre'))
-            
-            cache_key = (programa_nombre, cuatrimestre_str, grupo_clave)
-            
+            matricula = row.get('Matrícula')
+            grupo_clave = row.get('Grupo')
+            programa_nombre = row.get('Programa')
+            cuatrimestre_str = row.get('Cuatrimestre')
+
+            cache_key = clave_grupo(programa_nombre, cuatrimestre_str, grupo_clave)
+
             if not matricula or not all(cache_key):
                 continue
             
@@ -976,8 +1049,8 @@ def importar_relaciones_inscritos(df_inscritos, alumnos_cache, grupos_cache):
                 continue
             
             relacion = AlumnoGrupo(
-                alumno=alumno,
-                grupo=grupo,
+                alumno_id=alumno.id,
+                grupo_id=grupo.id,
                 fecha_inscripcion=today,
                 activo=1
             )
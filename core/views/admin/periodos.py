@@ -7,11 +7,22 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction, connection
+from django.core.cache import cache
 
 from core.models import Periodo, Grupo, AlumnoGrupo, Auditoria
 from core.utils.decorators import require_admin
 from core.utils.sync import sincronizar_is_active_alumnos
 
+# El periodo activo cambia pocas veces por semestre pero se consulta en cada
+# sesión de cliente — se cachea la respuesta y se invalida al activar/desactivar
+PERIODO_ACTIVO_CACHE_KEY = 'periodo_activo'
+PERIODO_ACTIVO_CACHE_TTL = 3600  # 1 hora
+
+
+def _invalidar_cache_periodo_activo():
+    """Programa la invalidación del cache al confirmar la transacción"""
+    transaction.on_commit(lambda: cache.delete(PERIODO_ACTIVO_CACHE_KEY))
+
 
 def _get_ip(request):
     forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -111,14 +122,6 @@ def activar_periodo_view(request, periodo_id):
         }
     }
     """
-    try:
-        periodo = Periodo.objects.get(id=periodo_id)
-    except Periodo.DoesNotExist:
-        return Response(
-            {'error': 'Periodo no encontrado'},
-            status=status.HTTP_404_NOT_FOUND
-        )
-
     desactivar_otros = request.data.get('desactivar_otros', True)
 
     cambios = {
@@ -129,63 +132,77 @@ def activar_periodo_view(request, periodo_id):
         'inscripciones_reactivadas': 0,
     }
 
-    with transaction.atomic():
-        with connection.cursor() as cursor:
+    try:
+        with transaction.atomic():
+            # Lock explícito del periodo objetivo ANTES de los UPDATEs masivos:
+            # orden de bloqueo determinista que evita deadlocks si dos admins
+            # activan periodos distintos a la vez
+            periodo = Periodo.objects.select_for_update().get(id=periodo_id)
 
-            # 1. ACTIVAR EL PERIODO SELECCIONADO
-            cursor.execute(
-                "UPDATE periodos SET activo = 1 WHERE id = %s",
-                [periodo_id]
-            )
+            with connection.cursor() as cursor:
 
-            # 2. REACTIVAR GRUPOS DEL PERIODO SELECCIONADO
-            # SQL directo evita subquery anidada de Django ORM
-            cursor.execute(
-                "UPDATE grupos SET activo = 1 WHERE periodo_id = %s",
-                [periodo_id]
-            )
-            cambios['grupos_reactivados'] = cursor.rowcount
-
-            # 3. REACTIVAR INSCRIPCIONES DEL PERIODO SELECCIONADO
-            # JOIN directo: mucho más eficiente que la subquery anidada del ORM
-            cursor.execute("""
-                UPDATE alumno_grupo ag
-                INNER JOIN grupos g ON ag.grupo_id = g.id
-                SET ag.activo = 1
-                WHERE g.periodo_id = %s
-            """, [periodo_id])
-            cambios['inscripciones_reactivadas'] = cursor.rowcount
-
-            if desactivar_otros:
-                # 4. DESACTIVAR PERIODOS (excluyendo el activado)
+                # 1. ACTIVAR EL PERIODO SELECCIONADO
                 cursor.execute(
-                    "UPDATE periodos SET activo = 0 WHERE id != %s AND activo = 1",
+                    "UPDATE periodos SET activo = 1 WHERE id = %s",
                     [periodo_id]
                 )
-                cambios['periodos_desactivados'] = cursor.rowcount
 
-                # 5. DESACTIVAR GRUPOS DE PERIODOS INACTIVOS
-                # JOIN directo en lugar de subquery anidada
-                cursor.execute("""
-                    UPDATE grupos g
-                    INNER JOIN periodos p ON g.periodo_id = p.id
-                    SET g.activo = 0
-                    WHERE p.activo = 0
-                      AND g.activo = 1
-                """)
-                cambios['grupos_desactivados'] = cursor.rowcount
+                # 2. REACTIVAR GRUPOS DEL PERIODO SELECCIONADO
+                # SQL directo evita subquery anidada de Django ORM
+                cursor.execute(
+                    "UPDATE grupos SET activo = 1 WHERE periodo_id = %s",
+                    [periodo_id]
+                )
+                cambios['grupos_reactivados'] = cursor.rowcount
 
-                # 6. DESACTIVAR INSCRIPCIONES DE GRUPOS INACTIVOS
-                # JOIN de 3 tablas directo — el más costoso, ahora eficiente
+                # 3. REACTIVAR INSCRIPCIONES DEL PERIODO SELECCIONADO
+                # JOIN directo: mucho más eficiente que la subquery anidada del ORM
                 cursor.execute("""
                     UPDATE alumno_grupo ag
                     INNER JOIN grupos g ON ag.grupo_id = g.id
-                    INNER JOIN periodos p ON g.periodo_id = p.id
-                    SET ag.activo = 0
-                    WHERE p.activo = 0
-                      AND ag.activo = 1
-                """)
-                cambios['inscripciones_desactivadas'] = cursor.rowcount
+                    SET ag.activo = 1
+                    WHERE g.periodo_id = %s
+                """, [periodo_id])
+                cambios['inscripciones_reactivadas'] = cursor.rowcount
+
+                if desactivar_otros:
+                    # 4. DESACTIVAR PERIODOS (excluyendo el activado)
+                    cursor.execute(
+                        "UPDATE periodos SET activo = 0 WHERE id != %s AND activo = 1",
+                        [periodo_id]
+                    )
+                    cambios['periodos_desactivados'] = cursor.rowcount
+
+                    # 5. DESACTIVAR GRUPOS DE PERIODOS INACTIVOS
+                    # JOIN directo en lugar de subquery anidada
+                    cursor.execute("""
+                        UPDATE grupos g
+                        INNER JOIN periodos p ON g.periodo_id = p.id
+                        SET g.activo = 0
+                        WHERE p.activo = 0
+                          AND g.activo = 1
+                    """)
+                    cambios['grupos_desactivados'] = cursor.rowcount
+
+                    # 6. DESACTIVAR INSCRIPCIONES DE GRUPOS INACTIVOS
+                    # JOIN de 3 tablas directo — el más costoso, ahora eficiente
+                    cursor.execute("""
+                        UPDATE alumno_grupo ag
+                        INNER JOIN grupos g ON ag.grupo_id = g.id
+                        INNER JOIN periodos p ON g.periodo_id = p.id
+                        SET ag.activo = 0
+                        WHERE p.activo = 0
+                          AND ag.activo = 1
+                    """)
+                    cambios['inscripciones_desactivadas'] = cursor.rowcount
+
+            _invalidar_cache_periodo_activo()
+
+    except Periodo.DoesNotExist:
+        return Response(
+            {'error': 'Periodo no encontrado'},
+            status=status.HTTP_404_NOT_FOUND
+        )
 
     periodo.refresh_from_db()
 
@@ -229,45 +246,50 @@ def desactivar_periodo_view(request, periodo_id):
         }
     }
     """
-    try:
-        periodo = Periodo.objects.get(id=periodo_id)
-    except Periodo.DoesNotExist:
-        return Response(
-            {'error': 'Periodo no encontrado'},
-            status=status.HTTP_404_NOT_FOUND
-        )
-
     cambios = {
         'grupos_desactivados': 0,
         'inscripciones_desactivadas': 0,
     }
 
-    with transaction.atomic():
-        with connection.cursor() as cursor:
+    try:
+        with transaction.atomic():
+            # Lock explícito del periodo objetivo primero — mismo orden de
+            # bloqueo que activar_periodo_view para evitar deadlocks cruzados
+            periodo = Periodo.objects.select_for_update().get(id=periodo_id)
 
-            # 1. DESACTIVAR EL PERIODO
-            cursor.execute(
-                "UPDATE periodos SET activo = 0 WHERE id = %s",
-                [periodo_id]
-            )
+            with connection.cursor() as cursor:
 
-            # 2. DESACTIVAR GRUPOS DEL PERIODO
-            cursor.execute(
-                "UPDATE grupos SET activo = 0 WHERE periodo_id = %s AND activo = 1",
-                [periodo_id]
-            )
-            cambios['grupos_desactivados'] = cursor.rowcount
-
-            # 3. DESACTIVAR INSCRIPCIONES DEL PERIODO
-            # JOIN directo en lugar de subquery anidada del ORM
-            cursor.execute("""
-                UPDATE alumno_grupo ag
-                INNER JOIN grupos g ON ag.grupo_id = g.id
-                SET ag.activo = 0
-                WHERE g.periodo_id = %s
-                  AND ag.activo = 1
-            """, [periodo_id])
-            cambios['inscripciones_desactivadas'] = cursor.rowcount
+                # 1. DESACTIVAR EL PERIODO
+                cursor.execute(
+                    "UPDATE periodos SET activo = 0 WHERE id = %s",
+                    [periodo_id]
+                )
+
+                # 2. DESACTIVAR GRUPOS DEL PERIODO
+                cursor.execute(
+                    "UPDATE grupos SET activo = 0 WHERE periodo_id = %s AND activo = 1",
+                    [periodo_id]
+                )
+                cambios['grupos_desactivados'] = cursor.rowcount
+
+                # 3. DESACTIVAR INSCRIPCIONES DEL PERIODO
+                # JOIN directo en lugar de subquery anidada del ORM
+                cursor.execute("""
+                    UPDATE alumno_grupo ag
+                    INNER JOIN grupos g ON ag.grupo_id = g.id
+                    SET ag.activo = 0
+                    WHERE g.periodo_id = %s
+                      AND ag.activo = 1
+                """, [periodo_id])
+                cambios['inscripciones_desactivadas'] = cursor.rowcount
+
+            _invalidar_cache_periodo_activo()
+
+    except Periodo.DoesNotExist:
+        return Response(
+            {'error': 'Periodo no encontrado'},
+            status=status.HTTP_404_NOT_FOUND
+        )
 
     periodo.refresh_from_db()
 
@@ -352,34 +374,38 @@ def crear_periodo_view(request):
     nombre = generar_nombre_periodo(anio, numero)
     fecha_inicio, fecha_fin = generar_fechas_periodo(anio, numero)
 
-    if Periodo.objects.filter(codigo=codigo).exists():
-        periodo_existente = Periodo.objects.get(codigo=codigo)
-        return Response(
-            {
-                'success': False,
-                'error': f'El periodo {codigo} ya existe',
-                'periodo': {
-                    'id': periodo_existente.id,
-                    'codigo': periodo_existente.codigo,
-                    'nombre': periodo_existente.nombre,
-                    'activo': periodo_existente.activo == 1,
-                },
-                'created': False
-            },
-            status=status.HTTP_400_BAD_REQUEST
+    with transaction.atomic():
+        # get_or_create apoyado en el unique de codigo: un solo statement
+        # atómico en lugar de exists() + get() + create() (sin carrera TOCTOU)
+        periodo, created = Periodo.objects.get_or_create(
+            codigo=codigo,
+            defaults={
+                'nombre': nombre,
+                'fecha_inicio': fecha_inicio,
+                'fecha_fin': fecha_fin,
+                'activo': 1 if activar_inmediatamente else 0,
+            }
         )
 
-    with transaction.atomic():
-        with connection.cursor() as cursor:
-            periodo = Periodo.objects.create(
-                codigo=codigo,
-                nombre=nombre,
-                fecha_inicio=fecha_inicio,
-                fecha_fin=fecha_fin,
-                activo=1 if activar_inmediatamente else 0
+        if not created:
+            return Response(
+                {
+                    'success': False,
+                    'error': f'El periodo {codigo} ya existe',
+                    'periodo': {
+                        'id': periodo.id,
+                        'codigo': periodo.codigo,
+                        'nombre': periodo.nombre,
+                        'activo': periodo.activo == 1,
+                    },
+                    'created': False
+                },
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-            if activar_inmediatamente:
+        if activar_inmediatamente:
+            # El cursor solo se abre si hay cascada de desactivación que ejecutar
+            with connection.cursor() as cursor:
                 # Desactivar periodos
                 cursor.execute(
                     "UPDATE periodos SET activo = 0 WHERE id != %s AND activo = 1",
@@ -401,15 +427,19 @@ def crear_periodo_view(request):
                     WHERE p.activo = 0 AND ag.activo = 1
                 """)
 
+            _invalidar_cache_periodo_activo()
+
+    # La respuesta se arma con los valores ya en memoria — create() regresa
+    # la instancia completa con pk, sin necesidad de releer la fila
     return Response({
         'success': True,
         'periodo': {
             'id': periodo.id,
-            'codigo': periodo.codigo,
-            'nombre': periodo.nombre,
-            'activo': periodo.activo == 1,
-            'fecha_inicio': periodo.fecha_inicio.isoformat(),
-            'fecha_fin': periodo.fecha_fin.isoformat(),
+            'codigo': codigo,
+            'nombre': nombre,
+            'activo': bool(activar_inmediatamente),
+            'fecha_inicio': fecha_inicio.isoformat(),
+            'fecha_fin': fecha_fin.isoformat(),
         },
         'created': True
     }, status=status.HTTP_201_CREATED)
@@ -435,10 +465,14 @@ def obtener_periodo_activo_view(request):
         }
     }
     """
+    data = cache.get(PERIODO_ACTIVO_CACHE_KEY)
+    if data is not None:
+        return Response(data, status=status.HTTP_200_OK)
+
     try:
         periodo = Periodo.objects.get(activo=1)
 
-        return Response({
+        data = {
             'periodo': {
                 'id': periodo.id,
                 'codigo': periodo.codigo,
@@ -447,7 +481,9 @@ def obtener_periodo_activo_view(request):
                 'fecha_inicio': periodo.fecha_inicio.isoformat() if periodo.fecha_inicio else None,
                 'fecha_fin': periodo.fecha_fin.isoformat() if periodo.fecha_fin else None,
             }
-        }, status=status.HTTP_200_OK)
+        }
+        cache.set(PERIODO_ACTIVO_CACHE_KEY, data, PERIODO_ACTIVO_CACHE_TTL)
+        return Response(data, status=status.HTTP_200_OK)
 
     except Periodo.DoesNotExist:
         return Response(
@@ -30,8 +30,17 @@ def listar_preguntas_view(request):
     - polaridad: POSITIVA | NEGATIVA (opcional)
     - activa: true | false (opcional)
     """
-    # Solo preguntas originales del banco — excluir copias creadas al clonar
-    preguntas = Pregunta.objects.prefetch_related('opciones').filter(es_copia=False)
+    # Solo preguntas originales del banco — excluir copias creadas al clonar.
+    # only() limita las columnas a las que usa PreguntaSerializer (descripcion
+    # es TEXT y es_copia/fechas extra no se serializan); select_related evita
+    # un query extra por pregunta al leer los campos del par.
+    preguntas = Pregunta.objects.filter(es_copia=False).select_related(
+        'par_pregunta'
+    ).prefetch_related('opciones').only(
+        'id', 'texto', 'tipo', 'polaridad', 'max_elecciones', 'orden',
+        'activa', 'descripcion', 'creado_en',
+        'par_pregunta__id', 'par_pregunta__texto', 'par_pregunta__polaridad',
+    )
 
     tipo = request.query_params.get('tipo')
     polaridad = request.query_params.get('polaridad')
@@ -136,30 +145,30 @@ def crear_pregunta_view(request):
                      f'Solo puedes agregar {disponibles} par(es) más.'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    # Validar todos los serializers antes de guardar
-    pares_validos = []
-    errores_validacion = []
-
-    for i, par in enumerate(pares):
+    # Validar todo el lote en una sola pasada many=True (ListSerializer)
+    # en lugar de construir y validar un serializer por pregunta.
+    # Se aplana [pos0, neg0, pos1, neg1, ...] para mapear errores de vuelta al par.
+    planas = []
+    for par in pares:
         # Forzar polaridad correcta
         par['positiva']['polaridad'] = 'POSITIVA'
         par['negativa']['polaridad'] = 'NEGATIVA'
+        planas.append(par['positiva'])
+        planas.append(par['negativa'])
 
-        serializer_pos = PreguntaSerializer(data=par['positiva'])
-        serializer_neg = PreguntaSerializer(data=par['negativa'])
+    serializer = PreguntaSerializer(data=planas, many=True)
 
-        errores_par = {}
-        if not serializer_pos.is_valid():
-            errores_par['positiva'] = serializer_pos.errors
-        if not serializer_neg.is_valid():
-            errores_par['negativa'] = serializer_neg.errors
-
-        if errores_par:
-            errores_validacion.append({'indice': i, 'errores': errores_par})
-        else:
-            pares_validos.append((serializer_pos, serializer_neg))
+    if not serializer.is_valid():
+        errores_validacion = []
+        for i in range(len(pares)):
+            errores_par = {}
+            if serializer.errors[2 * i]:
+                errores_par['positiva'] = serializer.errors[2 * i]
+            if serializer.errors[2 * i + 1]:
+                errores_par['negativa'] = serializer.errors[2 * i + 1]
+            if errores_par:
+                errores_validacion.append({'indice': i, 'errores': errores_par})
 
-    if errores_validacion:
         return Response({
             'success': False,
             'message': f'{len(errores_validacion)} par(es) con errores. No se guardó ninguno.',
@@ -169,21 +178,15 @@ def crear_pregunta_view(request):
     # Guardar todos los pares en una sola transacción atómica
     pares_creados = []
     with transaction.atomic():
-        for serializer_pos, serializer_neg in pares_validos:
-            pregunta_pos = serializer_pos.save()
-            pregunta_pos.es_copia = False
-            pregunta_pos.save()
-
-            pregunta_neg = serializer_neg.save()
-            pregunta_neg.es_copia = False
-            pregunta_neg.save()
+        preguntas_creadas = serializer.save(es_copia=False)
 
-            # Enlazar el par mutuamente
+        # Enlazar cada par mutuamente con un solo UPDATE por lote
+        for pregunta_pos, pregunta_neg in zip(preguntas_creadas[0::2], preguntas_creadas[1::2]):
             pregunta_pos.par_pregunta = pregunta_neg
-            pregunta_pos.save()
             pregunta_neg.par_pregunta = pregunta_pos
-            pregunta_neg.save()
+        Pregunta.objects.bulk_update(preguntas_creadas, ['par_pregunta'])
 
+        for pregunta_pos, pregunta_neg in zip(preguntas_creadas[0::2], preguntas_creadas[1::2]):
             pares_creados.append({
                 'positiva': PreguntaSerializer(pregunta_pos).data,
                 'negativa': PreguntaSerializer(pregunta_neg).data,
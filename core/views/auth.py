@@ -1,32 +1,106 @@
 # core/views/auth.py
 from datetime import timedelta
+
+import jwt as pyjwt
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Prefetch, Exists, OuterRef
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from core.models import User, Alumno, Docente, AlumnoGrupo  
-from core.utils.email import send_password_reset_email
+from core.models import User, Alumno, Docente, AlumnoGrupo, Grupo
+from core.utils.email import send_password_reset_email_async
+from core.utils.token_blacklist import marcar_token_usado, token_usado
+from core.utils.decorators import ratelimit
 from core.utils.auth_validators import (
     validate_user_active_status,
     CustomTokenObtainPairView
 )
 from ..serializers import (
-    LoginSerializer, RegisterSerializer, UserSerializer, AlumnoSerializer,
+    LoginSerializer, RegisterSerializer, UserSerializer,
     PasswordResetRequestSerializer, PasswordResetConfirmSerializer
 )
 
 
+# Configuración de firma resuelta una sola vez al importar el módulo —
+# evita pasar por LazySettings en cada verificación de token
+_JWT_SIGNING_KEY = settings.SIMPLE_JWT['SIGNING_KEY']
+_JWT_ALGORITHM = settings.SIMPLE_JWT.get('ALGORITHM', 'HS256')
+
+# TTL del cache de tokens de reset — igual a la vigencia del token (1 hora)
+_PWRESET_CACHE_TTL = 3600
+
+
+def _pwreset_cache_key(jti):
+    return f'pwreset:{jti}'
+
+
+def _user_to_dict(user):
+    """
+    Proyección plana de User con la misma forma que UserSerializer.
+
+    Evita reconstruir el mapa de campos de DRF en cada request de /me/;
+    UserSerializer se conserva para las rutas de escritura.
+    """
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'nombre_completo': user.nombre_completo,
+        'rol': user.rol,
+        'genero': user.genero,
+        'telefono': user.telefono,
+        'fecha_nacimiento': user.fecha_nacimiento.isoformat() if user.fecha_nacimiento else None,
+        'is_staff': user.is_staff,
+        'is_active': user.is_active,
+    }
+
+
+def _alumno_to_dict(alumno):
+    """
+    Proyección plana de Alumno con la misma forma que AlumnoSerializer.
+
+    /me/ es un endpoint caliente: construir el dict por acceso directo a
+    atributos evita el costo por campo de la maquinaria de DRF. Requiere
+    que alumno venga con select_related('user', 'plan_estudio').
+    """
+    user = alumno.user
+    return {
+        'id': alumno.id,
+        'user': _user_to_dict(user),
+        'matricula': alumno.matricula,
+        'nss': alumno.nss,
+        'nombre_completo': user.get_full_name(),
+        'plan_estudio': alumno.plan_estudio_id,
+        'plan_estudio_nombre': alumno.plan_estudio.nombre if alumno.plan_estudio else None,
+        'semestre_actual': alumno.semestre_actual,
+        'promedio': str(alumno.promedio) if alumno.promedio is not None else None,
+        'fecha_ingreso': alumno.fecha_ingreso.isoformat() if alumno.fecha_ingreso else None,
+        'estatus': alumno.estatus,
+    }
+
+
 # ============================================
 # ENDPOINTS DE AUTENTICACIÓN
 # ============================================
 
+# non_atomic_requests en las vistas que no escriben (o escriben una sola
+# sentencia): si el proyecto activa ATOMIC_REQUESTS, se ahorran los
+# BEGIN/COMMIT por request en el camino caliente de autenticación
+@transaction.non_atomic_requests
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@ratelimit('login', rate=20, period=60)
 def login_view(request):
     """
     Endpoint para login con username/matrícula y password
@@ -48,7 +122,25 @@ def login_view(request):
     
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        
+
+        # Un solo roundtrip trae el perfil (alumno/docente) junto con el user;
+        # la validación de estatus y la respuesta reutilizan este cache de
+        # select_related en lugar de repetir .get(user=user)
+        user = User.objects.select_related(
+            'alumno__plan_estudio__programa', 'docente__division'
+        ).only(
+            # Columnas que realmente consume la respuesta y la validación de
+            # estatus — deja fuera password, date_joined y demás del JOIN
+            'id', 'username', 'email', 'nombre_completo', 'first_name',
+            'last_name', 'rol', 'genero', 'is_staff', 'last_login',
+            'alumno__id', 'alumno__matricula', 'alumno__semestre_actual',
+            'alumno__promedio', 'alumno__estatus',
+            'alumno__plan_estudio__id', 'alumno__plan_estudio__programa__id',
+            'alumno__plan_estudio__programa__nombre',
+            'docente__id', 'docente__profesor_id', 'docente__es_tutor',
+            'docente__estatus', 'docente__division__id', 'docente__division__nombre',
+        ).get(pk=user.pk)
+
         # ============================================
         # VALIDAR ESTATUS ACTIVO
         # ============================================
@@ -56,32 +148,18 @@ def login_view(request):
         if not is_valid:
             return error_response
         
-        # Generar tokens JWT
+        # Generar tokens JWT — cada str() firma el JWT (HMAC-SHA256), por lo
+        # que se serializa exactamente una vez por token
         refresh = RefreshToken.for_user(user)
-
-        # Preparar respuesta con campos del User extendido
-        response_data = {
-            'access': str(refresh.access_token),
-            'refresh': str(refresh),
-            'first_login': user.last_login is None,  # Detectar primer login
-            'user': {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'nombre_completo': user.nombre_completo or user.get_full_name(),
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'rol': user.rol,
-                'genero': user.genero,
-                'is_staff': user.is_staff,
-            }
-        }
+        access_str = str(refresh.access_token)
+        refresh_str = str(refresh)
 
         # CAMBIO: Usar el campo rol para determinar el tipo de usuario
+        perfil = {}
         if user.rol == 'ALUMNO':
             try:
-                alumno = Alumno.objects.select_related('plan_estudio__programa').get(user=user)
-                response_data['user']['alumno'] = {
+                alumno = user.alumno
+                perfil['alumno'] = {
                     'id': alumno.id,
                     'matricula': alumno.matricula,
                     'semestre_actual': alumno.semestre_actual,
@@ -91,11 +169,11 @@ def login_view(request):
                 }
             except Alumno.DoesNotExist:
                 pass
-        
+
         elif user.rol == 'DOCENTE':
             try:
-                docente = Docente.objects.select_related('division').get(user=user)
-                response_data['user']['docente'] = {
+                docente = user.docente
+                perfil['docente'] = {
                     'id': docente.id,
                     'profesor_id': docente.profesor_id,
                     'es_tutor': docente.es_tutor,
@@ -103,12 +181,31 @@ def login_view(request):
                 }
             except Docente.DoesNotExist:
                 pass
-        
-        return Response(response_data, status=status.HTTP_200_OK)
+
+        # Respuesta en un solo literal: el dict anidado nace con su tamaño
+        # final y no se re-hashea con inserciones posteriores
+        return Response({
+            'access': access_str,
+            'refresh': refresh_str,
+            'first_login': user.last_login is None,  # Detectar primer login
+            'user': {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'nombre_completo': user.display_name,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'rol': user.rol,
+                'genero': user.genero,
+                'is_staff': user.is_staff,
+                **perfil,
+            },
+        }, status=status.HTTP_200_OK)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@transaction.non_atomic_requests
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout_view(request):
@@ -131,7 +228,12 @@ def logout_view(request):
         
         token = RefreshToken(refresh_token)
         token.blacklist()
-        
+
+        # Fast-path en cache para rechazar reusos sin consultar la BD;
+        # el TTL es el tiempo de vida restante del token
+        ttl = int(token['exp'] - timezone.now().timestamp())
+        marcar_token_usado(token['jti'], ttl)
+
         return Response(
             {'message': 'Logout exitoso'},
             status=status.HTTP_200_OK
@@ -166,19 +268,22 @@ def register_view(request):
     if serializer.is_valid():
         user = serializer.save()
         
-        # Generar tokens
+        # Generar tokens — una sola firma por token
         refresh = RefreshToken.for_user(user)
-        
+        access_str = str(refresh.access_token)
+        refresh_str = str(refresh)
+
         return Response({
             'message': 'Usuario registrado exitosamente',
             'user': UserSerializer(user).data,
-            'access': str(refresh.access_token),
-            'refresh': str(refresh),
+            'access': access_str,
+            'refresh': refresh_str,
         }, status=status.HTTP_201_CREATED)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@transaction.non_atomic_requests
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def me_view(request):
@@ -195,7 +300,7 @@ def me_view(request):
     """
     user = request.user
     response_data = {
-        'user': UserSerializer(user).data,
+        'user': _user_to_dict(user),
         'rol': user.rol  # Campo directo
     }
 
@@ -203,15 +308,23 @@ def me_view(request):
     if user.rol == 'ALUMNO':
         try:
             alumno = Alumno.objects.select_related(
-                'plan_estudio__programa__division'
-            ).get(user=user)
-            response_data['alumno'] = AlumnoSerializer(alumno).data
+                'user', 'plan_estudio'
+            ).defer('user__password').get(user=user)
+            response_data['alumno'] = _alumno_to_dict(alumno)
         except Alumno.DoesNotExist:
             pass
     
     elif user.rol == 'DOCENTE':
         try:
-            docente = Docente.objects.select_related('division').get(user=user)
+            # Los grupos de tutoría vienen prefetcheados en el mismo viaje,
+            # en lugar de un query extra en la rama es_tutor
+            docente = Docente.objects.select_related('division').prefetch_related(
+                Prefetch(
+                    'grupos_tutor',
+                    queryset=Grupo.objects.filter(activo=True).only('id', 'clave', 'grado', 'grupo'),
+                    to_attr='grupos_tutor_activos'
+                )
+            ).get(user=user)
             response_data['docente'] = {
                 'id': docente.id,
                 'profesor_id': docente.profesor_id,
@@ -220,14 +333,13 @@ def me_view(request):
                 'especialidad': docente.especialidad,
                 'estatus': docente.estatus,
             }
-            
+
             # Si es tutor, agregar grupos
             if docente.es_tutor:
-                response_data['grupos'] = list(
-                    docente.grupos_tutor.filter(activo=True).values(
-                        'id', 'clave', 'grado', 'grupo'
-                    )
-                )
+                response_data['grupos'] = [
+                    {'id': g.id, 'clave': g.clave, 'grado': g.grado, 'grupo': g.grupo}
+                    for g in docente.grupos_tutor_activos
+                ]
         except Docente.DoesNotExist:
             pass
     
@@ -261,28 +373,30 @@ def change_password_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    if not user.check_password(old_password):
-        return Response(
-            {'error': 'Contraseña actual incorrecta'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
+    # Las validaciones baratas van primero: un request malformado no debe
+    # pagar el costo del hash de check_password
     if new_password != new_password2:
         return Response(
             {'error': 'Las contraseñas nuevas no coinciden'},
             status=status.HTTP_400_BAD_REQUEST
         )
-    
+
     if len(new_password) < 8:
         return Response(
             {'error': 'La contraseña debe tener al menos 8 caracteres'},
             status=status.HTTP_400_BAD_REQUEST
         )
-    
-    # Cambiar contraseña
-    user.set_password(new_password)
-    user.save()
-    
+
+    if not user.check_password(old_password):
+        return Response(
+            {'error': 'Contraseña actual incorrecta'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Cambiar contraseña — UPDATE de una sola columna en lugar de
+    # reescribir toda la fila con user.save()
+    User.objects.filter(pk=user.pk).update(password=make_password(new_password))
+
     return Response(
         {'message': 'Contraseña actualizada exitosamente'},
         status=status.HTTP_200_OK
@@ -355,13 +469,13 @@ def first_login_change_password_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # ACTUALIZAR contraseña
-    user.set_password(new_password)
-    
-    # IMPORTANTE: Actualizar last_login para marcar que ya no es primer login
-    user.last_login = timezone.now()
-    user.save()
-    
+    # ACTUALIZAR contraseña y last_login (marca que ya no es primer login)
+    # en un solo UPDATE de dos columnas
+    User.objects.filter(pk=user.pk).update(
+        password=make_password(new_password),
+        last_login=timezone.now()
+    )
+
     return Response(
         {
             'message': 'Contraseña actualizada exitosamente',
@@ -372,8 +486,10 @@ def first_login_change_password_view(request):
     )
 
 
+@transaction.non_atomic_requests
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@ratelimit('verify_token', rate=60, period=60)
 def verify_token_view(request):
     """
     Endpoint para verificar si un token es válido
@@ -383,8 +499,6 @@ def verify_token_view(request):
         "token": "access_token"
     }
     """
-    from rest_framework_simplejwt.tokens import AccessToken
-    
     token = request.data.get('token')
     
     if not token:
@@ -394,7 +508,16 @@ def verify_token_view(request):
         )
     
     try:
-        AccessToken(token)
+        # Verificación de formato/firma/exp con PyJWT directo — mucho más
+        # barato que instanciar AccessToken para un chequeo de solo lectura
+        payload = pyjwt.decode(token, _JWT_SIGNING_KEY, algorithms=[_JWT_ALGORITHM])
+
+        if payload.get('token_type') != 'access':
+            return Response(
+                {'valid': False, 'error': 'Tipo de token incorrecto'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
         return Response(
             {'valid': True, 'message': 'Token válido'},
             status=status.HTTP_200_OK
@@ -408,6 +531,7 @@ def verify_token_view(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@ratelimit('password_reset', rate=5, period=60)
 def password_reset_request_view(request):
     """
     Endpoint para solicitar reset de contraseña
@@ -427,24 +551,24 @@ def password_reset_request_view(request):
         email = serializer.validated_data['email']
         
         try:
-            user = User.objects.get(email=email, is_active=True)
-            
-            # Generar token JWT especial para reset
-            refresh = RefreshToken.for_user(user)
-            
+            user = User.objects.only(
+                'id', 'email', 'nombre_completo', 'first_name', 'last_name'
+            ).get(email=email, is_active=True)
+
+            # Generar token JWT especial para reset. AccessToken.for_user no
+            # inserta en OutstandingToken (a diferencia de RefreshToken.for_user),
+            # así que el único INSERT es el registro manual de abajo
+            access_token = AccessToken.for_user(user)
+
             # Agregar claim personalizado
-            refresh['type'] = 'password_reset'
-            
-            # Token de acceso con expiración de 1 hora
-            access_token = refresh.access_token
+            access_token['type'] = 'password_reset'
+
+            # Expiración de 1 hora
             access_token.set_exp(lifetime=timedelta(hours=1))
-            
+
             reset_token = str(access_token)
             
             # Guardar el token en OutstandingToken para poder invalidarlo después
-            from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
-            from django.utils import timezone
-            
             OutstandingToken.objects.create(
                 user_id=user.id,
                 jti=access_token['jti'],
@@ -452,12 +576,19 @@ def password_reset_request_view(request):
                 created_at=timezone.now(),
                 expires_at=timezone.now() + timedelta(hours=1)
             )
-            
-            # Enviar correo
-            send_password_reset_email(
+
+            # Email del usuario en cache para que /validate/ responda sin BD
+            cache.set(
+                _pwreset_cache_key(access_token['jti']),
+                user.email,
+                _PWRESET_CACHE_TTL
+            )
+
+            # Enviar correo sin bloquear la respuesta en el RTT de SMTP
+            send_password_reset_email_async(
                 user_email=user.email,
                 reset_token=reset_token,
-                user_name=user.nombre_completo or user.get_full_name()
+                user_name=user.display_name
             )
             
         except User.DoesNotExist:
@@ -472,6 +603,7 @@ def password_reset_request_view(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@transaction.non_atomic_requests
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def password_reset_validate_view(request):
@@ -497,26 +629,34 @@ def password_reset_validate_view(request):
         )
     
     try:
-        # Decodificar token
-        access_token = AccessToken(token)
-        
+        # Decodificación barata con PyJWT (firma + exp) — sin la maquinaria
+        # completa de AccessToken para un chequeo de solo lectura
+        payload = pyjwt.decode(token, _JWT_SIGNING_KEY, algorithms=[_JWT_ALGORITHM])
+
         # Verificar que sea un token de tipo password_reset
-        if access_token.get('type') != 'password_reset':
+        if payload.get('type') != 'password_reset':
             return Response(
                 {'valid': False, 'error': 'Token inválido'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Verificar que el usuario exista y esté activo
-        user_id = access_token.get('user_id')
-        user = User.objects.get(id=user_id, is_active=True)
-        
+
+        # Fast-path: email cacheado al generar el token — cero queries
+        email = cache.get(_pwreset_cache_key(payload.get('jti')))
+
+        if email is None:
+            # Cache frío (reinicio/otro worker): verificar contra la BD
+            user = User.objects.only('id', 'email').get(
+                id=payload.get('user_id'), is_active=True
+            )
+            email = user.email
+            cache.set(_pwreset_cache_key(payload.get('jti')), email, _PWRESET_CACHE_TTL)
+
         return Response({
             'valid': True,
             'message': 'Token válido',
-            'email': user.email  # Para mostrar en el frontend
+            'email': email  # Para mostrar en el frontend
         }, status=status.HTTP_200_OK)
-        
+
     except Exception as e:
         return Response(
             {'valid': False, 'error': 'Token inválido o expirado'},
@@ -559,35 +699,44 @@ def password_reset_confirm_view(request):
                 )
             
             # Verificar si el token ya está en blacklist
-            from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
-            
             jti = access_token.get('jti')
-            outstanding_token = OutstandingToken.objects.filter(jti=jti).first()
-            
+
+            # Fast-path: reuso detectado en cache sin tocar la BD
+            if token_usado(jti):
+                return Response(
+                    {'error': 'Token ya ha sido utilizado'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Una sola consulta resuelve existencia + estado de blacklist,
+            # en lugar de un filter().first() más un exists() separados
+            outstanding_token = OutstandingToken.objects.filter(jti=jti).annotate(
+                ya_usado=Exists(BlacklistedToken.objects.filter(token=OuterRef('pk')))
+            ).first()
+
             if not outstanding_token:
                 return Response(
                     {'error': 'Token inválido'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            # Verificar si ya está en blacklist
-            if BlacklistedToken.objects.filter(token=outstanding_token).exists():
+
+            if outstanding_token.ya_usado:
                 return Response(
                     {'error': 'Token ya ha sido utilizado'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             # Obtener usuario
             user_id = access_token.get('user_id')
             user = User.objects.get(id=user_id, is_active=True)
             
-            # Actualizar contraseña
-            user.set_password(new_password)
-            user.save()
-            
-            # Agregar token al blacklist
-            BlacklistedToken.objects.create(token=outstanding_token)
-            
+            # Contraseña y blacklist en una transacción mínima: o se aplican
+            # ambas escrituras o ninguna (evita tokens quemados sin cambio)
+            with transaction.atomic():
+                User.objects.filter(pk=user.pk).update(password=make_password(new_password))
+                BlacklistedToken.objects.create(token=outstanding_token)
+            marcar_token_usado(jti, int(access_token['exp'] - timezone.now().timestamp()))
+
             return Response({
                 'message': 'Contraseña actualizada exitosamente'
             }, status=status.HTTP_200_OK)
@@ -6,21 +6,27 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from django.db import transaction
+from django.db.models import Count, Exists, OuterRef
 from django.utils import timezone
 
 from core.models import (
-    Cuestionario, CuestionarioEstado, Pregunta, Respuesta,
-    AlumnoGrupo, Alumno
+    Cuestionario, CuestionarioEstado, CuestionarioPregunta, Pregunta,
+    Respuesta, AlumnoGrupo, Alumno
 )
 from core.serializers import (
     CuestionarioListSerializer,
     CuestionarioDetailSerializer,
     RespuestaCreateSerializer,
+    ResponderCuestionarioSerializer,
     ProgresoAlumnoSerializer,
 )
 from core.utils.decorators import require_alumno
+from core.utils.survey_cache import (
+    disponibles_cache_key, skeleton_cache_key, DISPONIBLES_TTL, SKELETON_TTL
+)
 
 
 @api_view(['GET'])
@@ -46,16 +52,36 @@ def cuestionarios_disponibles_view(request):
             'message': 'No estas inscrito en ningun grupo activo'
         }, status=status.HTTP_200_OK)
 
-    cuestionarios = Cuestionario.objects.filter(
-        periodo=alumno_grupo.grupo.periodo,
-        activo=True
-    ).select_related('periodo').order_by('-creado_en')
-
-    cuestionarios_disponibles = [c for c in cuestionarios if c.esta_activo]
-    serializer = CuestionarioListSerializer(cuestionarios_disponibles, many=True)
+    # El payload serializado es identico para todo el periodo en el mismo
+    # dia: se cachea con TTL corto y solo grupo_actual se arma por alumno
+    periodo_id = alumno_grupo.grupo.periodo_id
+    cache_key = disponibles_cache_key(periodo_id, timezone.localdate())
+    cuestionarios_data = cache.get(cache_key)
+
+    if cuestionarios_data is None:
+        # La ventana de aplicacion (equivalente a esta_activo) se filtra en
+        # la BD: no se transfieren ni hidratan cuestionarios fuera de ventana
+        now = timezone.now()
+        cuestionarios_disponibles = Cuestionario.objects.filter(
+            periodo_id=periodo_id,
+            activo=True,
+            fecha_inicio__lte=now,
+            fecha_fin__gte=now
+        ).select_related('periodo').annotate(
+            # Totales en el mismo SQL — el serializer los lee en lugar de
+            # disparar un COUNT por fila con las properties del modelo
+            n_preguntas=Count('preguntas', distinct=True),
+            n_respuestas=Count('respuestas', distinct=True),
+            n_grupos=Count('estados__grupo', distinct=True),
+        ).order_by('-creado_en')
+
+        cuestionarios_data = CuestionarioListSerializer(
+            cuestionarios_disponibles, many=True
+        ).data
+        cache.set(cache_key, cuestionarios_data, DISPONIBLES_TTL)
 
     return Response({
-        'cuestionarios': serializer.data,
+        'cuestionarios': cuestionarios_data,
         'grupo_actual': {
             'id': alumno_grupo.grupo.id,
             'clave': alumno_grupo.grupo.clave
@@ -71,19 +97,35 @@ def detalle_cuestionario_alumno_view(request, cuestionario_id):
     Detalle de un cuestionario especifico
     GET /api/student/cuestionarios/{id}/
     """
-    cuestionario = get_object_or_404(
-        Cuestionario.objects.select_related('periodo'),
-        id=cuestionario_id
-    )
-
-    alumno_grupo = AlumnoGrupo.objects.filter(
+    # Camino rapido: si el alumno ya inicio el cuestionario su fila de
+    # CuestionarioEstado existe y un solo JOIN resuelve cuestionario +
+    # periodo + acceso en el mismo roundtrip
+    estado = CuestionarioEstado.objects.select_related(
+        'cuestionario', 'cuestionario__periodo'
+    ).filter(
+        cuestionario_id=cuestionario_id,
         alumno=request.alumno,
-        grupo__periodo=cuestionario.periodo,
-        activo=True
+        grupo__activo=True
     ).first()
 
-    if not alumno_grupo:
-        return Response({'error': 'No tienes acceso a este cuestionario'}, status=status.HTTP_403_FORBIDDEN)
+    if estado is not None:
+        cuestionario = estado.cuestionario
+    else:
+        cuestionario = get_object_or_404(
+            Cuestionario.objects.select_related('periodo'),
+            id=cuestionario_id
+        )
+
+        # Solo se necesita saber si hay inscripcion — exists() emite
+        # SELECT 1 ... LIMIT 1 sin hidratar el modelo
+        tiene_acceso = AlumnoGrupo.objects.filter(
+            alumno=request.alumno,
+            grupo__periodo=cuestionario.periodo,
+            activo=True
+        ).exists()
+
+        if not tiene_acceso:
+            return Response({'error': 'No tienes acceso a este cuestionario'}, status=status.HTTP_403_FORBIDDEN)
 
     if not cuestionario.esta_activo:
         return Response({'error': 'Este cuestionario no esta disponible en este momento'}, status=status.HTTP_400_BAD_REQUEST)
@@ -101,13 +143,20 @@ def preguntas_cuestionario_view(request, cuestionario_id):
     GET /api/student/cuestionarios/{id}/preguntas/
     """
     alumno = request.alumno
-    cuestionario = get_object_or_404(Cuestionario, id=cuestionario_id)
+    # only() con las columnas que la vista toca: titulo, ventana de
+    # actividad y la FK del periodo
+    cuestionario = get_object_or_404(
+        Cuestionario.objects.only(
+            'id', 'titulo', 'activo', 'fecha_inicio', 'fecha_fin', 'periodo'
+        ),
+        id=cuestionario_id
+    )
 
     alumno_grupo = AlumnoGrupo.objects.filter(
         alumno=alumno,
-        grupo__periodo=cuestionario.periodo,
+        grupo__periodo_id=cuestionario.periodo_id,
         activo=True
-    ).select_related('grupo').first()
+    ).select_related('grupo').only('grupo__id', 'grupo__clave').first()
 
     if not alumno_grupo:
         return Response({'error': 'No tienes acceso a este cuestionario'}, status=status.HTTP_403_FORBIDDEN)
@@ -115,42 +164,71 @@ def preguntas_cuestionario_view(request, cuestionario_id):
     if not cuestionario.esta_activo:
         return Response({'error': 'Este cuestionario no esta disponible'}, status=status.HTTP_400_BAD_REQUEST)
 
-    preguntas_cuestionario = cuestionario.preguntas.select_related('pregunta').order_by('orden')
+    # El esqueleto (preguntas sin ya_respondida + roster completo) es igual
+    # para todo el grupo y cambia rara vez: se cachea por (cuestionario,
+    # grupo) y cada alumno solo superpone su propio estado de respuesta
+    skeleton_key = skeleton_cache_key(cuestionario.id, alumno_grupo.grupo_id)
+    skeleton = cache.get(skeleton_key)
 
-    preguntas_data = []
-    for cp in preguntas_cuestionario:
-        pregunta = cp.pregunta
-        ya_respondio = Respuesta.objects.filter(
-            alumno=alumno, cuestionario=cuestionario, pregunta=pregunta
-        ).exists()
-        preguntas_data.append({
-            'id': pregunta.id,
-            'texto': pregunta.texto,
-            'tipo': pregunta.tipo,
-            'max_elecciones': pregunta.max_elecciones,
-            'descripcion': pregunta.descripcion,
-            'orden': cp.orden,
-            'ya_respondida': ya_respondio
-        })
-
-    # Se obtiene la lista completa ordenada para que numero_lista
-    # refleje la posición real en la lista del grupo (sin excluir al alumno)
-    todos_grupo = AlumnoGrupo.objects.filter(
-        grupo=alumno_grupo.grupo,
-        activo=True
-    ).select_related('alumno', 'alumno__user').order_by(
-        'alumno__user__last_name', 'alumno__user__first_name'
+    if skeleton is None:
+        preguntas_cuestionario = cuestionario.preguntas.select_related('pregunta').only(
+            'orden', 'pregunta__id', 'pregunta__texto', 'pregunta__tipo',
+            'pregunta__max_elecciones', 'pregunta__descripcion'
+        ).order_by('orden')
+
+        preguntas_skeleton = [
+            {
+                'id': cp.pregunta.id,
+                'texto': cp.pregunta.texto,
+                'tipo': cp.pregunta.tipo,
+                'max_elecciones': cp.pregunta.max_elecciones,
+                'descripcion': cp.pregunta.descripcion,
+                'orden': cp.orden,
+            }
+            for cp in preguntas_cuestionario
+        ]
+
+        # Se obtiene la lista completa ordenada para que numero_lista
+        # refleje la posición real en la lista del grupo (sin excluir al
+        # alumno). values() trae solo las columnas usadas, sin hidratar
+        # AlumnoGrupo/Alumno/User por fila
+        todos_grupo = AlumnoGrupo.objects.filter(
+            grupo=alumno_grupo.grupo,
+            activo=True
+        ).order_by(
+            'alumno__user__last_name', 'alumno__user__first_name'
+        ).values(
+            'alumno_id', 'alumno__matricula',
+            'alumno__user__last_name', 'alumno__user__first_name'
+        )
+
+        skeleton = {
+            'preguntas': preguntas_skeleton,
+            'companeros': [
+                {
+                    'numero_lista': i,
+                    'id': ag['alumno_id'],
+                    'matricula': ag['alumno__matricula'],
+                    'nombre': f"{ag['alumno__user__last_name']} {ag['alumno__user__first_name']}".strip()
+                }
+                for i, ag in enumerate(todos_grupo, start=1)
+            ],
+        }
+        cache.set(skeleton_key, skeleton, SKELETON_TTL)
+
+    # Una sola consulta por alumno trae sus preguntas respondidas
+    preguntas_respondidas_ids = set(
+        Respuesta.objects.filter(
+            alumno=alumno, cuestionario=cuestionario
+        ).values_list('pregunta_id', flat=True).distinct()
     )
 
+    preguntas_data = [
+        {**p, 'ya_respondida': p['id'] in preguntas_respondidas_ids}
+        for p in skeleton['preguntas']
+    ]
     companeros_data = [
-        {
-            'numero_lista': i,
-            'id': ag.alumno.id,
-            'matricula': ag.alumno.matricula,
-            'nombre': f"{ag.alumno.user.last_name} {ag.alumno.user.first_name}".strip()
-        }
-        for i, ag in enumerate(todos_grupo, start=1)
-        if ag.alumno_id != alumno.id
+        c for c in skeleton['companeros'] if c['id'] != alumno.id
     ]
 
     return Response({
@@ -197,10 +275,49 @@ def responder_cuestionario_view(request, cuestionario_id):
     - Atomico: o se guarda todo o nada
     """
     alumno = request.alumno
-    cuestionario = get_object_or_404(
-        Cuestionario.objects.select_related('periodo'),
-        id=cuestionario_id
-    )
+
+    # Camino rapido: el flujo normal pasa por iniciar/, asi que la fila de
+    # CuestionarioEstado ya existe y un solo JOIN trae estado +
+    # cuestionario + periodo + grupo en el mismo roundtrip; la inscripcion
+    # queda implicita en la propia fila de estado
+    estado = CuestionarioEstado.objects.select_related(
+        'cuestionario', 'cuestionario__periodo', 'grupo'
+    ).only(
+        'estado', 'progreso', 'fecha_inicio', 'fecha_fin',
+        'cuestionario__id', 'cuestionario__activo',
+        'cuestionario__fecha_inicio', 'cuestionario__fecha_fin',
+        'cuestionario__periodo__id', 'cuestionario__periodo__activo',
+        'grupo__id', 'grupo__clave'
+    ).filter(
+        cuestionario_id=cuestionario_id,
+        alumno=alumno,
+        grupo__activo=True
+    ).first()
+
+    if estado is not None:
+        cuestionario = estado.cuestionario
+        grupo = estado.grupo
+        tiene_acceso = True
+    else:
+        # Primer envio sin estado previo: resolucion completa con el
+        # acceso como subquery EXISTS en el mismo roundtrip
+        cuestionario = get_object_or_404(
+            Cuestionario.objects.select_related('periodo').only(
+                'id', 'activo', 'fecha_inicio', 'fecha_fin',
+                'periodo__id', 'periodo__activo'
+            ).annotate(
+                tiene_acceso=Exists(
+                    AlumnoGrupo.objects.filter(
+                        alumno=alumno,
+                        grupo__periodo=OuterRef('periodo'),
+                        activo=True
+                    )
+                )
+            ),
+            id=cuestionario_id
+        )
+        grupo = None
+        tiene_acceso = cuestionario.tiene_acceso
 
     # ── Validacion 1: periodo activo ──────────────────────────────────────
     if not cuestionario.periodo.activo:
@@ -215,24 +332,27 @@ def responder_cuestionario_view(request, cuestionario_id):
         }, status=status.HTTP_400_BAD_REQUEST)
 
     # ── Validacion 3: alumno pertenece al grupo del periodo ───────────────
-    alumno_grupo = AlumnoGrupo.objects.filter(
-        alumno=alumno,
-        grupo__periodo=cuestionario.periodo,
-        activo=True
-    ).select_related('grupo').first()
-
-    if not alumno_grupo:
+    if not tiene_acceso:
         return Response({
             'error': 'No tienes acceso a este cuestionario'
         }, status=status.HTTP_403_FORBIDDEN)
 
-    # ── Validacion 4: no haber completado ya el cuestionario ─────────────
-    estado = CuestionarioEstado.objects.filter(
-        cuestionario=cuestionario,
-        alumno=alumno,
-        grupo=alumno_grupo.grupo
-    ).first()
+    if grupo is None:
+        # Con acceso confirmado, una sola query trae el grupo de inscripcion
+        alumno_grupo = AlumnoGrupo.objects.filter(
+            alumno=alumno,
+            grupo__periodo_id=cuestionario.periodo_id,
+            activo=True
+        ).select_related('grupo').only('grupo__id', 'grupo__clave').first()
+        grupo = alumno_grupo.grupo
+
+        estado = CuestionarioEstado.objects.filter(
+            cuestionario=cuestionario,
+            alumno=alumno,
+            grupo=grupo
+        ).first()
 
+    # ── Validacion 4: no haber completado ya el cuestionario ─────────────
     if estado and estado.estado == 'COMPLETADO':
         return Response({
             'error': 'Ya completaste este cuestionario',
@@ -249,160 +369,144 @@ def responder_cuestionario_view(request, cuestionario_id):
         }, status=status.HTTP_400_BAD_REQUEST)
 
     # ── Pre-validacion de todo el payload antes de tocar la BD ───────────
-    # Obtener IDs validos del grupo (en batch — sin N+1)
-    alumnos_grupo_ids = set(
-        AlumnoGrupo.objects.filter(
-            grupo=alumno_grupo.grupo,
-            activo=True
-        ).exclude(alumno=alumno).values_list('alumno_id', flat=True)
-    )
-
-    # Obtener preguntas del cuestionario en batch
+    # Una sola query trae las preguntas con las columnas que usa la
+    # validacion y el calculo de puntaje
     preguntas_cuestionario = {
         cp.pregunta_id: cp.pregunta
-        for cp in cuestionario.preguntas.select_related('pregunta')
+        for cp in CuestionarioPregunta.objects.filter(
+            cuestionario_id=cuestionario.id
+        ).select_related('pregunta').only(
+            'pregunta_id', 'pregunta__tipo', 'pregunta__max_elecciones'
+        )
     }
 
-    errores_validacion = []
-
-    for resp_data in respuestas_data:
-        pregunta_id = resp_data.get('pregunta_id')
-
-        # Pregunta existe y pertenece al cuestionario
-        if pregunta_id not in preguntas_cuestionario:
-            errores_validacion.append({
-                'pregunta_id': pregunta_id,
-                'error': 'Esta pregunta no pertenece al cuestionario'
-            })
-            continue
-
-        pregunta = preguntas_cuestionario[pregunta_id]
-
-        if pregunta.tipo == 'SELECCION_ALUMNO':
-            seleccionados = resp_data.get('seleccionados', [])
+    # IDs validos del grupo (en batch — sin N+1). Solo se consulta si el
+    # payload trae alguna pregunta de seleccion; para envios de solo
+    # OPCION/TEXTO la query se omite por completo
+    hay_seleccion = any(
+        preguntas_cuestionario[r.get('pregunta_id')].tipo == 'SELECCION_ALUMNO'
+        for r in respuestas_data
+        if r.get('pregunta_id') in preguntas_cuestionario
+    )
+    alumnos_grupo_ids = frozenset(
+        AlumnoGrupo.objects.filter(
+            grupo=grupo,
+            activo=True
+        ).exclude(alumno=alumno).values_list('alumno_id', flat=True)
+    ) if hay_seleccion else frozenset()
+
+    # La validacion completa del payload vive en el serializer — una sola
+    # pasada por pregunta con los mismos mensajes y forma de error
+    payload_serializer = ResponderCuestionarioSerializer(
+        data={'respuestas': respuestas_data},
+        context={
+            'alumno_id': alumno.id,
+            'alumnos_grupo_ids': alumnos_grupo_ids,
+            'preguntas_cuestionario': preguntas_cuestionario,
+        }
+    )
 
-            # Validacion: exactamente max_elecciones
-            if len(seleccionados) != pregunta.max_elecciones:
-                errores_validacion.append({
-                    'pregunta_id': pregunta_id,
-                    'error': (
-                        f'Debes seleccionar exactamente {pregunta.max_elecciones} '
-                        f'companero(s). Enviaste {len(seleccionados)}.'
-                    )
-                })
-                continue
-
-            alumno_ids_enviados = [sel.get('alumno_id') for sel in seleccionados]
-            ordenes_enviados = [sel.get('orden') for sel in seleccionados]
-
-            # Validacion: no autovoto
-            if alumno.id in alumno_ids_enviados:
-                errores_validacion.append({
-                    'pregunta_id': pregunta_id,
-                    'error': 'No puedes votarte a ti mismo'
-                })
-                continue
-
-            # Validacion: todos los destinos pertenecen al grupo
-            ids_fuera_de_grupo = set(alumno_ids_enviados) - alumnos_grupo_ids
-            if ids_fuera_de_grupo:
-                errores_validacion.append({
-                    'pregunta_id': pregunta_id,
-                    'error': f'Los siguientes alumnos no pertenecen a tu grupo: {list(ids_fuera_de_grupo)}'
-                })
-                continue
-
-            # Validacion: sin duplicados en destinos
-            if len(alumno_ids_enviados) != len(set(alumno_ids_enviados)):
-                errores_validacion.append({
-                    'pregunta_id': pregunta_id,
-                    'error': 'No puedes seleccionar al mismo companero dos veces en la misma pregunta'
-                })
-                continue
-
-            # Validacion: ordenes unicos
-            if len(ordenes_enviados) != len(set(ordenes_enviados)):
-                errores_validacion.append({
-                    'pregunta_id': pregunta_id,
-                    'error': 'No puedes asignar el mismo orden a dos companeros distintos'
-                })
-                continue
-
-        elif pregunta.tipo == 'OPCION':
-            if not resp_data.get('opcion_id'):
-                errores_validacion.append({
-                    'pregunta_id': pregunta_id,
-                    'error': 'Debe seleccionar una opcion'
-                })
-
-        elif pregunta.tipo == 'TEXTO':
-            if not resp_data.get('texto_respuesta', '').strip():
-                errores_validacion.append({
-                    'pregunta_id': pregunta_id,
-                    'error': 'Debe proporcionar una respuesta de texto'
-                })
-
-    # Si hay cualquier error de validacion — no se guarda nada
-    if errores_validacion:
+    # Si hay cualquier error de validacion — no se guarda nada. Se prefiere
+    # la lista cruda del serializer: en .errors DRF ya convirtio pregunta_id
+    # a ErrorDetail (str) y aqui debe viajar como int, igual que siempre
+    if not payload_serializer.is_valid():
+        errores = getattr(payload_serializer, 'errores_crudos', None)
+        if errores is None:
+            errores = payload_serializer.errors.get('errores', payload_serializer.errors)
         return Response({
             'success': False,
             'error': 'El envio contiene errores de validacion. No se guardo ninguna respuesta.',
-            'errores': errores_validacion
+            'errores': errores
         }, status=status.HTTP_400_BAD_REQUEST)
 
     # ── Guardar — todo o nada ─────────────────────────────────────────────
-    with transaction.atomic():
-        respuestas_creadas = []
-
+    # Un solo DELETE sobre todas las preguntas del payload y un solo
+    # bulk_create con la union de respuestas nuevas: 2 sentencias en vez
+    # de 2 por pregunta (permite re-envio parcial igual que antes)
+    pregunta_ids_payload = [r.get('pregunta_id') for r in respuestas_data]
+
+    def _generar_respuestas():
+        # Generador que emite las Respuesta del payload ya validado; se
+        # materializa una sola vez justo antes del bulk_create
         for resp_data in respuestas_data:
-            pregunta_id = resp_data.get('pregunta_id')
-            pregunta = preguntas_cuestionario[pregunta_id]
-
-            # Eliminar respuestas previas de esta pregunta (permite re-envio parcial)
-            Respuesta.objects.filter(
-                alumno=alumno,
-                cuestionario=cuestionario,
-                pregunta=pregunta
-            ).delete()
+            pregunta = preguntas_cuestionario[resp_data.get('pregunta_id')]
 
             if pregunta.tipo == 'SELECCION_ALUMNO':
-                seleccionados = resp_data.get('seleccionados', [])
-                nuevas = []
-                for sel in seleccionados:
+                for sel in resp_data.get('seleccionados', []):
                     orden = sel.get('orden', 1)
-                    puntaje = max(1, pregunta.max_elecciones - orden + 1)
-                    nuevas.append(Respuesta(
+                    yield Respuesta(
                         alumno=alumno,
                         cuestionario=cuestionario,
                         pregunta=pregunta,
                         seleccionado_alumno_id=sel.get('alumno_id'),
                         orden_eleccion=orden,
-                        puntaje=puntaje
-                    ))
-                creadas = Respuesta.objects.bulk_create(nuevas)
-                respuestas_creadas.extend([r.id for r in creadas])
+                        puntaje=max(1, pregunta.max_elecciones - orden + 1)
+                    )
 
             elif pregunta.tipo == 'OPCION':
-                respuesta = Respuesta.objects.create(
+                yield Respuesta(
                     alumno=alumno, cuestionario=cuestionario,
                     pregunta=pregunta, opcion_id=resp_data.get('opcion_id')
                 )
-                respuestas_creadas.append(respuesta.id)
 
             elif pregunta.tipo == 'TEXTO':
-                respuesta = Respuesta.objects.create(
+                yield Respuesta(
                     alumno=alumno, cuestionario=cuestionario,
                     pregunta=pregunta,
                     texto_respuesta=resp_data.get('texto_respuesta', '').strip()
                 )
-                respuestas_creadas.append(respuesta.id)
+
+    nuevas_respuestas = list(_generar_respuestas())
+
+    with transaction.atomic():
+        # Re-chequeo bajo lock: dos POST concurrentes podrian pasar ambos la
+        # validacion optimista de arriba; select_for_update serializa y el
+        # segundo ve el estado COMPLETADO que dejo el primero
+        if estado:
+            estado = CuestionarioEstado.objects.select_for_update().get(pk=estado.pk)
+            if estado.estado == 'COMPLETADO':
+                return Response({
+                    'error': 'Ya completaste este cuestionario',
+                    'message': 'No puedes volver a responder un cuestionario completado',
+                    'progreso': float(estado.progreso),
+                    'fecha_fin': estado.fecha_fin
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        Respuesta.objects.filter(
+            alumno=alumno,
+            cuestionario=cuestionario,
+            pregunta_id__in=pregunta_ids_payload
+        ).delete()
+
+        # En MySQL bulk_create ya emite INSERTs multi-fila; batch_size
+        # acota cada sentencia por debajo de max_allowed_packet
+        Respuesta.objects.bulk_create(nuevas_respuestas, batch_size=500)
 
         if estado:
-            estado.actualizar_progreso()
+            # Inline de actualizar_progreso() sin sus dos SELECTs: el total
+            # sale del prefetch y las respondidas de un aggregate; un solo
+            # UPDATE con update_fields en lugar del save() completo
+            total_preguntas = len(preguntas_cuestionario)
+            respondidas = Respuesta.objects.filter(
+                alumno=alumno, cuestionario=cuestionario
+            ).aggregate(n=Count('pregunta_id', distinct=True))['n'] or 0
+
+            estado.progreso = (respondidas / total_preguntas) * 100 if total_preguntas else 0
+            ahora = timezone.now()
+            if estado.progreso == 0:
+                estado.estado = 'PENDIENTE'
+            elif estado.progreso == 100:
+                estado.estado = 'COMPLETADO'
+                estado.fecha_inicio = estado.fecha_inicio or ahora
+                estado.fecha_fin = estado.fecha_fin or ahora
+            else:
+                estado.estado = 'EN_PROGRESO'
+                estado.fecha_inicio = estado.fecha_inicio or ahora
+            estado.save(update_fields=['progreso', 'estado', 'fecha_inicio', 'fecha_fin'])
 
     return Response({
         'success': True,
-        'respuestas_guardadas': len(respuestas_creadas),
+        'respuestas_guardadas': len(nuevas_respuestas),
         'progreso': float(estado.progreso) if estado else 0
     }, status=status.HTTP_201_CREATED)
 
@@ -418,21 +522,27 @@ def iniciar_cuestionario_view(request, cuestionario_id):
     """
     alumno = request.alumno
     cuestionario = get_object_or_404(
-        Cuestionario.objects.select_related('periodo'),
+        Cuestionario.objects.select_related('periodo').only(
+            'id', 'activo', 'fecha_inicio', 'fecha_fin',
+            'periodo__id', 'periodo__activo'
+        ),
         id=cuestionario_id
     )
 
+    # Un solo instante de referencia para toda la vista
+    ahora = timezone.now()
+
     if not cuestionario.periodo.activo:
         return Response({'error': 'El periodo de este cuestionario no esta activo'}, status=status.HTTP_400_BAD_REQUEST)
 
-    if not cuestionario.esta_activo:
+    if not cuestionario.esta_activo_en(ahora):
         return Response({'error': 'Este cuestionario no esta disponible en este momento'}, status=status.HTTP_400_BAD_REQUEST)
 
     alumno_grupo = AlumnoGrupo.objects.filter(
         alumno=alumno,
-        grupo__periodo=cuestionario.periodo,
+        grupo__periodo_id=cuestionario.periodo_id,
         activo=True
-    ).select_related('grupo').first()
+    ).select_related('grupo').only('grupo__id', 'grupo__clave').first()
 
     if not alumno_grupo:
         return Response({'error': 'No tienes acceso a este cuestionario'}, status=status.HTTP_403_FORBIDDEN)
@@ -441,7 +551,7 @@ def iniciar_cuestionario_view(request, cuestionario_id):
         cuestionario=cuestionario,
         alumno=alumno,
         grupo=alumno_grupo.grupo,
-        defaults={'estado': 'EN_PROGRESO', 'fecha_inicio': timezone.now()}
+        defaults={'estado': 'EN_PROGRESO', 'fecha_inicio': ahora}
     )
 
     if estado.estado == 'COMPLETADO':
@@ -453,7 +563,7 @@ def iniciar_cuestionario_view(request, cuestionario_id):
 
     # Si ya existía pero no tenía fecha_inicio, la asignamos ahora
     if not creado and not estado.fecha_inicio:
-        estado.fecha_inicio = timezone.now()
+        estado.fecha_inicio = ahora
         estado.estado = 'EN_PROGRESO'
         estado.save(update_fields=['fecha_inicio', 'estado'])
 
@@ -475,37 +585,71 @@ def mi_progreso_view(request, cuestionario_id):
     GET /api/student/cuestionarios/{id}/mi-progreso/
     """
     alumno = request.alumno
-    cuestionario = get_object_or_404(Cuestionario, id=cuestionario_id)
 
-    alumno_grupo = AlumnoGrupo.objects.filter(
+    # Camino rapido: este endpoint se consulta por polling con el
+    # cuestionario ya iniciado, asi que el JOIN estado -> cuestionario ->
+    # grupo resuelve todo en un solo roundtrip
+    estado = CuestionarioEstado.objects.select_related(
+        'cuestionario', 'grupo'
+    ).only(
+        'estado', 'progreso', 'fecha_inicio', 'fecha_fin',
+        'cuestionario__id', 'cuestionario__titulo',
+        'grupo__id', 'grupo__clave'
+    ).filter(
+        cuestionario_id=cuestionario_id,
         alumno=alumno,
-        grupo__periodo=cuestionario.periodo,
-        activo=True
-    ).select_related('grupo').first()
+        grupo__activo=True
+    ).first()
 
-    if not alumno_grupo:
-        return Response({'error': 'No tienes acceso a este cuestionario'}, status=status.HTTP_403_FORBIDDEN)
+    if estado is not None:
+        cuestionario = estado.cuestionario
+        grupo = estado.grupo
+    else:
+        # Sin estado: se distingue entre falta de acceso (403) y
+        # cuestionario aun no iniciado (404)
+        cuestionario = get_object_or_404(
+            Cuestionario.objects.only('id', 'titulo', 'periodo').annotate(
+                tiene_acceso=Exists(
+                    AlumnoGrupo.objects.filter(
+                        alumno=alumno,
+                        grupo__periodo=OuterRef('periodo'),
+                        activo=True
+                    )
+                )
+            ),
+            id=cuestionario_id
+        )
 
-    estado = CuestionarioEstado.objects.filter(
-        cuestionario=cuestionario,
-        alumno=alumno,
-        grupo=alumno_grupo.grupo
-    ).first()
+        if not cuestionario.tiene_acceso:
+            return Response({'error': 'No tienes acceso a este cuestionario'}, status=status.HTTP_403_FORBIDDEN)
 
-    if not estado:
-        return Response({'error': 'No se encontro tu registro de progreso'}, status=status.HTTP_404_NOT_FOUND)
+        alumno_grupo = AlumnoGrupo.objects.filter(
+            alumno=alumno,
+            grupo__periodo_id=cuestionario.periodo_id,
+            activo=True
+        ).select_related('grupo').only('grupo__id', 'grupo__clave').first()
+        grupo = alumno_grupo.grupo
+
+        estado = CuestionarioEstado.objects.filter(
+            cuestionario=cuestionario,
+            alumno=alumno,
+            grupo=grupo
+        ).first()
+
+        if not estado:
+            return Response({'error': 'No se encontro tu registro de progreso'}, status=status.HTTP_404_NOT_FOUND)
 
     total_preguntas = cuestionario.total_preguntas
-    preguntas_respondidas = Respuesta.objects.filter(
-        alumno=alumno,
-        cuestionario=cuestionario
-    ).values('pregunta').distinct().count()
+    # progreso se mantiene en sync en cada guardado de respuestas, asi que
+    # las respondidas se derivan sin consultar la tabla de respuestas
+    # (este endpoint se consulta por polling durante la aplicacion)
+    preguntas_respondidas = round(float(estado.progreso) * total_preguntas / 100)
 
     return Response({
         'cuestionario_id': cuestionario.id,
         'cuestionario_titulo': cuestionario.titulo,
-        'grupo_id': alumno_grupo.grupo.id,
-        'grupo_clave': alumno_grupo.grupo.clave,
+        'grupo_id': grupo.id,
+        'grupo_clave': grupo.clave,
         'total_preguntas': total_preguntas,
         'preguntas_respondidas': preguntas_respondidas,
         'progreso': float(estado.progreso),
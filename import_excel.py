@@ -8,21 +8,33 @@ MEJORAS:
 - Gestión de bajas automáticas (alumnos que ya no aparecen)
 - Reporte detallado de cambios
 """
+import atexit
 import os
 import sys
 import django
 from datetime import date, datetime
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import re
 
 # Configurar Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sociograma_project.settings')
 django.setup()
 
+# Script de larga duración: con DEBUG activo Django acumula cada query en
+# connection.queries y la memoria crece sin límite durante la importación
+from django.conf import settings
+settings.DEBUG = False
+
 from core.models import (
     User, Division, Programa, PlanEstudio, Periodo, Docente, Grupo, Alumno, AlumnoGrupo
 )
-from django.db import transaction
+from core.utils.import_excel_helpers import (
+    clave_grupo, deduplicar_hoja, generar_codigo_programa
+)
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
 import pandas as pd
 
 
@@ -32,23 +44,38 @@ import pandas as pd
 
 class Logger:
     """Clase para manejar logging dual (consola + archivo) con seguimiento de errores"""
-    
+
+    # Compilado una sola vez — log() se llama miles de veces por importación
+    _ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
     def __init__(self, log_file='importacion.log'):
         self.log_file = log_file
         self.terminal = sys.stdout
         self.errores_por_seccion = defaultdict(list)  # Almacenar errores por sección
-        
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            f.write(f"{'='*70}\n")
-            f.write(f"LOG DE IMPORTACIÓN - {timestamp}\n")
-            f.write(f"{'='*70}\n\n")
-    
+
+        # Un solo handle con buffer grande durante toda la importación en
+        # lugar de open/close (o un flush) por cada línea de log; close()
+        # via atexit garantiza el vaciado final
+        self._fh = open(self.log_file, 'w', encoding='utf-8', buffering=1 << 20)
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._fh.write(f"{'='*70}\n")
+        self._fh.write(f"LOG DE IMPORTACIÓN - {timestamp}\n")
+        self._fh.write(f"{'='*70}\n\n")
+        atexit.register(self.close)
+
+    def close(self):
+        """Cerrar el archivo de log (se registra en atexit)"""
+        if not self._fh.closed:
+            self._fh.flush()
+            self._fh.close()
+
     def log(self, message):
         print(message)
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            clean_message = re.sub(r'\x1b\[[0-9;]*m', '', str(message))
-            f.write(clean_message + '\n')
+        msg = str(message)
+        # Fast-path: casi ninguna linea trae secuencias ANSI, el chequeo
+        # de substring evita entrar al motor de regex
+        clean_message = self._ANSI_RE.sub('', msg) if '\x1b' in msg else msg
+        self._fh.write(clean_message + '\n')
     
     def log_error(self, message, seccion=None):
         error_msg = f"❌ ERROR: {message}"
@@ -83,21 +110,16 @@ class Logger:
             self.log(f"\n🔴 {seccion.upper()}: {len(errores)} errores")
             self.log("-" * 70)
             
-            # Agrupar errores similares
-            errores_unicos = {}
-            for error in errores:
-                if error in errores_unicos:
-                    errores_unicos[error] += 1
-                else:
-                    errores_unicos[error] = 1
-            
+            # Agrupar errores similares (una sola pasada en C)
+            errores_unicos = Counter(errores)
+
             # Mostrar primeros 10 errores únicos
-            for i, (error, count) in enumerate(list(errores_unicos.items())[:10], 1):
+            for i, (error, count) in enumerate(errores_unicos.most_common(10), 1):
                 if count > 1:
                     self.log(f"  {i}. {error} (×{count})")
                 else:
                     self.log(f"  {i}. {error}")
-            
+
             if len(errores_unicos) > 10:
                 self.log(f"  ... y {len(errores_unicos) - 10} errores más")
 
@@ -108,16 +130,50 @@ logger = Logger()
 # FUNCIONES AUXILIARES
 # =============================================================================
 
+# Patrones precompilados: se aplican una vez por división/grupo importado
+_RE_NO_MAYUSCULAS = re.compile(r'[^A-Z]')
+_RE_GRADO = re.compile(r'^\d+')
+
+
 def limpiar_texto(texto):
     if pd.isna(texto) or texto == '':
         return None
     return str(texto).strip()
 
 
+def limpiar_columna(series):
+    """Versión vectorizada de limpiar_texto para una columna completa"""
+    stripped = series.astype('string').str.strip()
+    # astype(object) + where regresa None (no pd.NA) para que las
+    # validaciones "if not valor" de los loops sigan funcionando
+    return stripped.astype(object).where(stripped.notna() & (stripped != ''), None)
+
+
+def limpiar_columnas(df, columnas):
+    """Limpia in-place las columnas indicadas que existan en el DataFrame"""
+    for col in columnas:
+        if col in df.columns:
+            df[col] = limpiar_columna(df[col])
+
+
+# Memoizado: se invoca dos veces por matrícula (una por pasada del loop)
+@lru_cache(maxsize=8192)
 def generar_username(matricula_o_empleado):
     return str(matricula_o_empleado).strip().lower().replace(' ', '')
 
 
+# Tamaño de bloque transaccional: acota locks y undo por commit; re-ejecutar
+# tras un fallo parcial es seguro porque los importadores son idempotentes
+CHUNK_IMPORT = 2000
+
+
+def en_bloques(items, tam=CHUNK_IMPORT):
+    """Genera sublistas de tamaño acotado para confirmar por bloque"""
+    items = list(items)
+    for i in range(0, len(items), tam):
+        yield items[i:i + tam]
+
+
 # =============================================================================
 # GESTIÓN DE PERIODOS
 # =============================================================================
@@ -150,19 +206,20 @@ def seleccionar_periodo():
         }
     }
     
-    # Mostrar periodos existentes
-    periodos_existentes = Periodo.objects.all().order_by('-codigo')
-    
-    if periodos_existentes.exists():
+    # Mostrar periodos existentes — materializados una sola vez; el
+    # exists() + enumerate + list() anteriores evaluaban el queryset tres veces
+    periodos_existentes = list(Periodo.objects.all().order_by('-codigo'))
+
+    if periodos_existentes:
         logger.log("\nPERIODOS EN LA BASE DE DATOS:")
         for idx, p in enumerate(periodos_existentes, 1):
             estado = "🟢 ACTIVO" if p.activo == 1 else "⚪ INACTIVO"
             logger.log(f"{idx}. {p.codigo} - {p.nombre} {estado}")
-        
+
         usar_existente = input("\n¿Usar un periodo existente? (número) o 'n' para crear nuevo: ").strip()
-        
+
         if usar_existente.isdigit() and 1 <= int(usar_existente) <= len(periodos_existentes):
-            periodo = list(periodos_existentes)[int(usar_existente) - 1]
+            periodo = periodos_existentes[int(usar_existente) - 1]
             logger.log_success(f"Usando periodo: {periodo.codigo} - {periodo.nombre}")
             return periodo
     else:
@@ -251,7 +308,9 @@ def importar_divisiones_programas(df_alumnos, df_grupos):
     
     divisiones_cache = {}
     programas_cache = {}
-    
+    divisiones_creadas = 0
+    programas_creados = 0
+
     # Obtener divisiones únicas
     divisiones_unicas = set()
     if 'División' in df_alumnos.columns:
@@ -265,7 +324,7 @@ def importar_divisiones_programas(df_alumnos, df_grupos):
         if not div_nombre:
             continue
             
-        codigo = re.sub(r'[^A-Z]', '', div_nombre.upper())[:10]
+        codigo = _RE_NO_MAYUSCULAS.sub('', div_nombre.upper())[:10]
         if not codigo:
             codigo = div_nombre[:10].upper()
         
@@ -278,49 +337,51 @@ def importar_divisiones_programas(df_alumnos, df_grupos):
         )
         
         divisiones_cache[div_nombre] = division
-        status = "✅" if created else "ℹ️"
-        logger.log(f"  {status} División: {div_nombre}")
-    
+        if created:
+            divisiones_creadas += 1
+
+    # Solo el conteo: una linea por division/programa se vuelve ruido (y
+    # costo de I/O) en importaciones grandes
+    logger.log_success(
+        f"Divisiones: {divisiones_creadas} creadas, "
+        f"{len(divisiones_cache) - divisiones_creadas} existentes"
+    )
+
     # Obtener programas únicos
     programas_unicos = set()
     if 'Programa' in df_alumnos.columns:
         programas_unicos.update(df_alumnos['Programa'].dropna().unique())
     if 'Programa' in df_grupos.columns:
         programas_unicos.update(df_grupos['Programa'].dropna().unique())
-    
+
+    # Mapa Programa -> División en una sola pasada sobre la hoja, en lugar
+    # de re-escanear el DataFrame por cada combinación programa/división
+    prog_to_div = {}
+    if 'Programa' in df_alumnos.columns and 'División' in df_alumnos.columns:
+        pares = df_alumnos[['Programa', 'División']].dropna().drop_duplicates('Programa')
+        prog_to_div = {
+            limpiar_texto(prog): limpiar_texto(div)
+            for prog, div in zip(pares['Programa'], pares['División'])
+        }
+
+    # División por defecto capturada una sola vez para el fallback
+    division_default = next(iter(divisiones_cache.values()), None)
+
     # Crear programas
     for prog_nombre in programas_unicos:
         prog_nombre = limpiar_texto(prog_nombre)
         if not prog_nombre:
             continue
+
+        # Buscar división correspondiente en el mapa precalculado
+        division = divisiones_cache.get(prog_to_div.get(prog_nombre))
+
+        if not division:
+            division = division_default
         
-        # Buscar división correspondiente
-        division = None
-        for div_nombre, div_obj in divisiones_cache.items():
-            mask_alumnos = (df_alumnos['Programa'] == prog_nombre) if 'Programa' in df_alumnos.columns else pd.Series([False] * len(df_alumnos))
-            if mask_alumnos.any():
-                div_alumno = df_alumnos.loc[mask_alumnos, 'División'].iloc[0]
-                if limpiar_texto(div_alumno) == div_nombre:
-                    division = div_obj
-                    break
-        
-        if not division and divisiones_cache:
-            division = list(divisiones_cache.values())[0]
-        
-        # Generar código corto
-        nombre_limpio = re.sub(r'\s*-\s*\d{4}', '', prog_nombre)
-        palabras = nombre_limpio.split()
-        
-        if len(palabras) >= 3:
-            codigo = ''.join([p[0].upper() for p in palabras if len(p) > 2])[:8]
-        elif len(palabras) == 2:
-            codigo = ''.join([p[:4].upper() for p in palabras])[:8]
-        else:
-            codigo = ''.join([c.upper() for c in nombre_limpio if c.isalnum()])[:8]
-        
-        if not codigo or len(codigo) < 2:
-            codigo = nombre_limpio.replace(' ', '')[:20].upper()
-        
+        # Generar código corto (memoizado a nivel de proceso)
+        codigo = generar_codigo_programa(prog_nombre)
+
         programa, created = Programa.objects.get_or_create(
             codigo=codigo,
             defaults={
@@ -332,9 +393,14 @@ def importar_divisiones_programas(df_alumnos, df_grupos):
         )
         
         programas_cache[prog_nombre] = programa
-        status = "✅" if created else "ℹ️"
-        logger.log(f"  {status} Programa: {prog_nombre} (Código: {codigo})")
-    
+        if created:
+            programas_creados += 1
+
+    logger.log_success(
+        f"Programas: {programas_creados} creados, "
+        f"{len(programas_cache) - programas_creados} existentes"
+    )
+
     return divisiones_cache, programas_cache
 
 
@@ -348,83 +414,92 @@ def importar_tutores(df_tutores, divisiones_cache):
     total_creados = 0
     total_omitidos = 0
     errores = 0
-    
-    with transaction.atomic():
-        for idx, row in df_tutores.iterrows():
-            try:
-                empleado_id = limpiar_texto(row.get('No. de empleado'))
-                nombres = limpiar_texto(row.get('Nombres', ''))
-                a_paterno = limpiar_texto(row.get('A. Paterno', ''))
-                a_materno = limpiar_texto(row.get('A. Materno', ''))
-                sexo = limpiar_texto(row.get('Sexo', ''))
-                division_nombre = limpiar_texto(row.get('División', ''))
-                puesto = limpiar_texto(row.get('Puesto', ''))
-                email = limpiar_texto(row.get('Email', ''))
+
+    # Limpieza vectorizada de toda la hoja — una pasada por columna en
+    # lugar de limpiar_texto celda por celda dentro del loop
+    limpiar_columnas(df_tutores, [
+        'No. de empleado', 'Nombres', 'A. Paterno', 'A. Materno',
+        'Sexo', 'División', 'Puesto', 'Email'
+    ])
+
+    for bloque in en_bloques(list(enumerate(df_tutores.to_dict('records')))):
+        with transaction.atomic():
+            for idx, row in bloque:
+                try:
+                    empleado_id = row.get('No. de empleado')
+                    nombres = row.get('Nombres', '')
+                    a_paterno = row.get('A. Paterno', '')
+                    a_materno = row.get('A. Materno', '')
+                    sexo = row.get('Sexo', '')
+                    division_nombre = row.get('División', '')
+                    puesto = row.get('Puesto', '')
+                    email = row.get('Email', '')
                 
-                # Validación básica
-                if not empleado_id or not nombres:
-                    total_omitidos += 1
-                    continue
+                    # Validación básica
+                    if not empleado_id or not nombres:
+                        total_omitidos += 1
+                        continue
                 
-                # Construir nombre completo
-                apellidos = f"{a_paterno or ''} {a_materno or ''}".strip()
-                nombre_completo = f"{nombres} {apellidos}".strip()
+                    # Construir nombre completo
+                    apellidos = f"{a_paterno or ''} {a_materno or ''}".strip()
+                    nombre_completo = f"{nombres} {apellidos}".strip()
                 
-                # Normalizar género
-                genero = None
-                if sexo:
-                    sexo_lower = sexo.lower()
-                    if 'h' in sexo_lower or 'm' == sexo_lower:
-                        genero = 'Masculino'
-                    elif 'f' in sexo_lower or 'mujer' in sexo_lower:
-                        genero = 'Femenino'
+                    # Normalizar género
+                    genero = None
+                    if sexo:
+                        sexo_lower = sexo.lower()
+                        if 'h' in sexo_lower or 'm' == sexo_lower:
+                            genero = 'Masculino'
+                        elif 'f' in sexo_lower or 'mujer' in sexo_lower:
+                            genero = 'Femenino'
                 
-                username = generar_username(empleado_id)
-                user, user_created = User.objects.get_or_create(
-                    username=username,
-                    defaults={
-                        'first_name': nombres,
-                        'last_name': apellidos,
-                        'email': email or f"{username}@utpuebla.edu.mx",
-                        'is_staff': True,
-                        'is_active': True,
-                        'rol': 'DOCENTE',
-                        'nombre_completo': nombre_completo,
-                        'genero': genero,
-                    }
-                )
+                    username = generar_username(empleado_id)
+                    user, user_created = User.objects.get_or_create(
+                        username=username,
+                        defaults={
+                            'first_name': nombres,
+                            'last_name': apellidos,
+                            'email': email or f"{username}@utpuebla.edu.mx",
+                            'is_staff': True,
+                            'is_active': True,
+                            'rol': 'DOCENTE',
+                            'nombre_completo': nombre_completo,
+                            'genero': genero,
+                        }
+                    )
                 
-                if user_created:
-                    user.set_password(empleado_id)
-                    user.save()
+                    if user_created:
+                        user.set_password(empleado_id)
+                        user.save()
                 
-                # Obtener división
-                division = divisiones_cache.get(division_nombre)
+                    # Obtener división
+                    division = divisiones_cache.get(division_nombre)
                 
-                # Crear docente
-                docente, created = Docente.objects.get_or_create(
-                    profesor_id=empleado_id,
-                    defaults={
-                        'user': user,
-                        'division': division,
-                        'es_tutor': True,
-                        'especialidad': puesto,
-                        'estatus': 'ACTIVO'
-                    }
-                )
+                    # Crear docente (por *_id: evita el refresco de estado
+                    # relacionado por fila)
+                    docente, created = Docente.objects.get_or_create(
+                        profesor_id=empleado_id,
+                        defaults={
+                            'user_id': user.pk,
+                            'division_id': division.pk if division else None,
+                            'es_tutor': True,
+                            'especialidad': puesto,
+                            'estatus': 'ACTIVO'
+                        }
+                    )
                 
-                tutores_cache[empleado_id] = docente
+                    tutores_cache[empleado_id] = docente
                 
-                if created:
-                    total_creados += 1
-                    # Mostrar progreso cada 10
-                    if total_creados % 10 == 0:
-                        logger.log_progress(total_creados, len(df_tutores), "Tutores creados")
+                    if created:
+                        total_creados += 1
+                        # Mostrar progreso cada 10
+                        if total_creados % 10 == 0:
+                            logger.log_progress(total_creados, len(df_tutores), "Tutores creados")
                 
-            except Exception as e:
-                errores += 1
-                error_msg = f"Fila {idx+2} (ID: {empleado_id if 'empleado_id' in locals() else 'N/A'}): {str(e)}"
-                logger.log_error(error_msg, SECCION)
+                except Exception as e:
+                    errores += 1
+                    error_msg = f"Fila {idx+2} (ID: {empleado_id if 'empleado_id' in locals() else 'N/A'}): {str(e)}"
+                    logger.log_error(error_msg, SECCION)
     
     # Resumen final
     logger.log("\n   " + "-"*60)
@@ -447,80 +522,101 @@ def importar_grupos(df_grupos, programas_cache, tutores_cache, periodo):
     total_creados = 0
     total_omitidos = 0
     errores = 0
-    
-    with transaction.atomic():
-        for idx, row in df_grupos.iterrows():
-            try:
-                cuatrimestre_str = limpiar_texto(row.get('Cuatrimestre'))
-                grupo_clave = limpiar_texto(row.get('Grupo'))
-                division_nombre = limpiar_texto(row.get('División'))
-                programa_nombre = limpiar_texto(row.get('Programa'))
-                tutor_nombre = limpiar_texto(row.get('Tutor Asignado', ''))
-                turno = limpiar_texto(row.get('Turno', 'Matutino'))
+
+    # Limpieza vectorizada de la hoja completa antes del loop
+    limpiar_columnas(df_grupos, [
+        'Cuatrimestre', 'Grupo', 'División', 'Programa',
+        'Tutor Asignado', 'Turno'
+    ])
+
+    # Indice nombre->docente precalculado con los users en un solo query:
+    # evita el scan sobre tutores_cache con acceso lazy a doc.user (N+1)
+    # por cada grupo
+    tutores_por_nombre = {}
+    for doc in Docente.objects.filter(profesor_id__in=tutores_cache).select_related('user'):
+        nombre = (doc.user.nombre_completo or doc.user.get_full_name()).lower()
+        tutores_por_nombre[nombre] = tutores_cache[doc.profesor_id]
+    tutores_resueltos = {}
+
+    for bloque in en_bloques(list(enumerate(df_grupos.to_dict('records')))):
+        with transaction.atomic():
+            for idx, row in bloque:
+                try:
+                    cuatrimestre_str = row.get('Cuatrimestre')
+                    grupo_clave = row.get('Grupo')
+                    division_nombre = row.get('División')
+                    programa_nombre = row.get('Programa')
+                    tutor_nombre = row.get('Tutor Asignado', '')
+                    turno = row.get('Turno', 'Matutino')
                 
-                if not grupo_clave or not programa_nombre:
-                    total_omitidos += 1
-                    continue
+                    if not grupo_clave or not programa_nombre:
+                        total_omitidos += 1
+                        continue
                 
-                # Normalizar turno
-                if turno and turno.lower() not in ['matutino', 'vespertino', 'nocturno']:
-                    turno = 'Matutino'
-                elif turno:
-                    turno = turno.capitalize()
+                    # Normalizar turno
+                    if turno and turno.lower() not in ['matutino', 'vespertino', 'nocturno']:
+                        turno = 'Matutino'
+                    elif turno:
+                        turno = turno.capitalize()
                 
-                # Obtener programa
-                programa = programas_cache.get(programa_nombre)
-                if not programa:
-                    error_msg = f"Fila {idx+2}: Programa no encontrado '{programa_nombre}'"
-                    logger.log_error(error_msg, SECCION)
-                    errores += 1
-                    continue
+                    # Obtener programa
+                    programa = programas_cache.get(programa_nombre)
+                    if not programa:
+                        error_msg = f"Fila {idx+2}: Programa no encontrado '{programa_nombre}'"
+                        logger.log_error(error_msg, SECCION)
+                        errores += 1
+                        continue
                 
-                # Buscar tutor
-                tutor = None
-                if tutor_nombre:
-                    for empleado_id, doc in tutores_cache.items():
-                        nombre_completo = doc.user.nombre_completo or doc.user.get_full_name()
-                        if tutor_nombre.lower() in nombre_completo.lower():
-                            tutor = doc
-                            break
+                    # Buscar tutor en el indice, memoizando por nombre: los
+                    # grupos repiten tutor y cada nombre se resuelve una vez
+                    tutor = None
+                    if tutor_nombre:
+                        tutor_lower = tutor_nombre.lower()
+                        if tutor_lower in tutores_resueltos:
+                            tutor = tutores_resueltos[tutor_lower]
+                        else:
+                            tutor = next(
+                                (doc for nombre, doc in tutores_por_nombre.items() if tutor_lower in nombre),
+                                None
+                            )
+                            tutores_resueltos[tutor_lower] = tutor
                 
-                # Extraer grado
-                grado_match = re.match(r'^\d+', str(cuatrimestre_str)) 
-                grado_final = grado_match.group(0) if grado_match else 'SG'
+                    # Extraer grado
+                    grado_match = _RE_GRADO.match(str(cuatrimestre_str))
+                    grado_final = grado_match.group(0) if grado_match else 'SG'
                 
-                # Generar clave única
-                clave_unica_bd = f"{programa.codigo}-{grado_final}-{grupo_clave}"
-
-                # Crear grupo
-                grupo, created = Grupo.objects.get_or_create(
-                    clave=clave_unica_bd,
-                    periodo=periodo,
-                    defaults={
-                        'grado': grado_final, 
-                        'grupo': grupo_clave,
-                        'turno': turno or 'Matutino',
-                        'programa': programa,
-                        'tutor': tutor,
-                        'activo': 1,  # Cambio: usar 1 en lugar de True
-                        'cupo_maximo': 40
-                    }
-                )
+                    # Generar clave única
+                    clave_unica_bd = f"{programa.codigo}-{grado_final}-{grupo_clave}"
+
+                    # Crear grupo
+                    grupo, created = Grupo.objects.get_or_create(
+                        clave=clave_unica_bd,
+                        periodo_id=periodo.pk,
+                        defaults={
+                            'grado': grado_final,
+                            'grupo': grupo_clave,
+                            'turno': turno or 'Matutino',
+                            'programa_id': programa.pk,
+                            'tutor_id': tutor.pk if tutor else None,
+                            'activo': 1,  # Cambio: usar 1 en lugar de True
+                            'cupo_maximo': 40
+                        }
+                    )
                 
-                # Cache con tupla
-                cache_key = (programa_nombre, cuatrimestre_str, grupo_clave)
-                grupos_cache[cache_key] = grupo
+                    # Cache con tupla normalizada
+                    cache_key = clave_grupo(programa_nombre, cuatrimestre_str, grupo_clave)
+                    grupos_cache[cache_key] = grupo
                 
-                if created:
-                    total_creados += 1
-                    # Mostrar progreso cada 20
-                    if total_creados % 20 == 0:
-                        logger.log_progress(total_creados, len(df_grupos), "Grupos creados")
+                    if created:
+                        total_creados += 1
+                        # Mostrar progreso cada 20
+                        if total_creados % 20 == 0:
+                            logger.log_progress(total_creados, len(df_grupos), "Grupos creados")
                 
-            except Exception as e:
-                errores += 1
-                error_msg = f"Fila {idx+2} (Grupo: {grupo_clave if 'grupo_clave' in locals() else 'N/A'}): {str(e)}"
-                logger.log_error(error_msg, SECCION)
+                except Exception as e:
+                    errores += 1
+                    error_msg = f"Fila {idx+2} (Grupo: {grupo_clave if 'grupo_clave' in locals() else 'N/A'}): {str(e)}"
+                    logger.log_error(error_msg, SECCION)
     
     # Resumen final
     logger.log("\n   " + "-"*60)
@@ -544,100 +640,156 @@ def importar_alumnos(df_alumnos, programas_cache):
     total_creados = 0
     total_omitidos = 0
     errores = 0
-    
-    with transaction.atomic():
-        for idx, row in df_alumnos.iterrows():
-            try:
-                matricula = limpiar_texto(row.get('Matrícula'))
-                nombres = limpiar_texto(row.get('Nombres', ''))
-                a_paterno = limpiar_texto(row.get('A. Paterno', ''))
-                a_materno = limpiar_texto(row.get('A. Materno', ''))
-                sexo = limpiar_texto(row.get('Sexo', ''))
-                nss = limpiar_texto(row.get('NSS', ''))
-                programa_nombre = limpiar_texto(row.get('Programa', ''))
-                email = limpiar_texto(row.get('Email Institucional') or row.get('Email', ''))
-                
-                if not matricula or not nombres:
-                    total_omitidos += 1
-                    continue
-                
-                # Construir nombre completo
-                apellidos = f"{a_paterno or ''} {a_materno or ''}".strip()
-                nombre_completo = f"{nombres} {apellidos}".strip()
-                
-                # Obtener programa
-                programa = programas_cache.get(programa_nombre)
-                
-                # Crear plan de estudio
-                plan_estudio = None
-                if programa:
-                    plan_codigo = f"{programa.codigo}-2020"
-                    
-                    plan_estudio, _ = PlanEstudio.objects.get_or_create(
-                        codigo=plan_codigo,
-                        programa=programa,
-                        defaults={
-                            'nombre': plan_codigo,
-                            'anio_inicio': 2020,
-                            'activo': 1
-                        }
-                    )
-                
+
+    # Limpieza vectorizada — en la hoja de alumnos (la más grande) es donde
+    # más pesa evitar limpiar_texto por celda
+    limpiar_columnas(df_alumnos, [
+        'Matrícula', 'Nombres', 'A. Paterno', 'A. Materno', 'Sexo',
+        'NSS', 'Programa', 'Email Institucional', 'Email'
+    ])
+
+    # 1. Filtrar filas validas en memoria (primera aparicion por matricula,
+    # igual que hacia get_or_create con duplicados)
+    filas = {}
+    for idx, row in enumerate(df_alumnos.to_dict('records')):
+        matricula = row.get('Matrícula')
+        nombres = row.get('Nombres', '')
+
+        if not matricula or not nombres:
+            total_omitidos += 1
+            continue
+
+        if matricula not in filas:
+            filas[matricula] = row
+
+    # 2. Planes de estudio — uno por programa referenciado, no por fila
+    planes_cache = {}
+    for row in filas.values():
+        programa = programas_cache.get(row.get('Programa', ''))
+        if programa and programa.codigo not in planes_cache:
+            plan_codigo = f"{programa.codigo}-2020"
+            plan_estudio, _ = PlanEstudio.objects.get_or_create(
+                codigo=plan_codigo,
+                programa=programa,
+                defaults={
+                    'nombre': plan_codigo,
+                    'anio_inicio': 2020,
+                    'activo': 1
+                }
+            )
+            planes_cache[programa.codigo] = plan_estudio
+
+    usernames = {matricula: generar_username(matricula) for matricula in filas}
+
+    # 3. Users y alumnos por bloques: cada bloque de matriculas se confirma
+    # en su propia transaccion en lugar de acumular todo el undo en una sola
+    for bloque in en_bloques(filas.items()):
+        with transaction.atomic():
+            # Una query por los existentes del bloque y un solo bulk_create
+            # para los nuevos, en lugar de get_or_create por fila
+            usuarios = {
+                u.username: u
+                for u in User.objects.filter(
+                    username__in=[usernames[matricula] for matricula, _ in bloque]
+                )
+            }
+
+            pendientes = [
+                (matricula, row)
+                for matricula, row in bloque
+                if usernames[matricula] not in usuarios
+            ]
+
+            # PBKDF2 es deliberadamente lento por diseño; los hashes del
+            # bloque se calculan en paralelo entre cores en lugar de
+            # hashear en serie sobre el hilo principal
+            hashes = []
+            if pendientes:
+                with ProcessPoolExecutor() as pool:
+                    hashes = list(pool.map(
+                        make_password,
+                        [matricula for matricula, _ in pendientes],
+                        chunksize=64
+                    ))
+
+            nuevos_users = []
+            for (matricula, row), password_hash in zip(pendientes, hashes):
+                username = usernames[matricula]
+                nombres = row.get('Nombres', '')
+                apellidos = f"{row.get('A. Paterno', '') or ''} {row.get('A. Materno', '') or ''}".strip()
+                email = row.get('Email Institucional') or row.get('Email', '')
+
                 # Normalizar género
                 genero = None
+                sexo = row.get('Sexo', '')
                 if sexo:
                     sexo_lower = sexo.lower()
                     if 'h' in sexo_lower or 'm' == sexo_lower:
                         genero = 'Masculino'
                     elif 'f' in sexo_lower or 'mujer' in sexo_lower:
                         genero = 'Femenino'
-                
-                username = generar_username(matricula)
-                user, user_created = User.objects.get_or_create(
+
+                nuevos_users.append(User(
                     username=username,
-                    defaults={
-                        'first_name': nombres,
-                        'last_name': apellidos,
-                        'email': email or f"{username}@alumno.utpuebla.edu.mx",
-                        'is_active': True,
-                        'rol': 'ALUMNO',
-                        'nombre_completo': nombre_completo,
-                        'genero': genero,
-                    }
+                    first_name=nombres,
+                    last_name=apellidos,
+                    email=email or f"{username}@alumno.utpuebla.edu.mx",
+                    is_active=True,
+                    rol='ALUMNO',
+                    nombre_completo=f"{nombres} {apellidos}".strip(),
+                    genero=genero,
+                    password=password_hash,
+                ))
+
+            if nuevos_users:
+                # ignore_conflicts replica la semantica de get_or_create (no
+                # toca filas existentes) y es portable a MySQL; se relee el
+                # batch porque MySQL no regresa los pks insertados
+                User.objects.bulk_create(nuevos_users, batch_size=500, ignore_conflicts=True)
+                usuarios.update({
+                    u.username: u
+                    for u in User.objects.filter(
+                        username__in=[u.username for u in nuevos_users]
+                    )
+                })
+
+            # 4. Alumnos del bloque con el mismo patron
+            alumnos_existentes = {
+                a.matricula: a
+                for a in Alumno.objects.filter(
+                    matricula__in=[matricula for matricula, _ in bloque]
                 )
-                
-                if user_created:
-                    user.set_password(matricula)
-                    user.save()
-                
-                # Crear alumno
-                alumno, created = Alumno.objects.get_or_create(
+            }
+
+            nuevos_alumnos = []
+            for matricula, row in bloque:
+                if matricula in alumnos_existentes:
+                    alumnos_cache[matricula] = alumnos_existentes[matricula]
+                    continue
+
+                programa = programas_cache.get(row.get('Programa', ''))
+                plan_estudio = planes_cache.get(programa.codigo) if programa else None
+                nuevos_alumnos.append(Alumno(
                     matricula=matricula,
-                    defaults={
-                        'user': user,
-                        'nss': nss,
-                        'plan_estudio': plan_estudio,
-                        'semestre_actual': 1,
-                        'estatus': 'ACTIVO'
-                    }
-                )
-                
-                alumnos_cache[matricula] = alumno
-                
-                if created:
-                    total_creados += 1
-                    # Mostrar progreso cada 500
-                    if total_creados % 500 == 0:
-                        logger.log_progress(total_creados, len(df_alumnos), "Alumnos creados")
-                
-            except Exception as e:
-                errores += 1
-                error_msg = f"Fila {idx+2} (Matrícula: {matricula if 'matricula' in locals() else 'N/A'}): {str(e)}"
-                logger.log_error(error_msg, SECCION)
-                
-                # Si hay muchos errores seguidos, pausar y mostrar
-                if errores % 100 == 0:
-                    logger.log_warning(f"⚠️  Se han detectado {errores} errores hasta ahora...")
+                    user_id=usuarios[usernames[matricula]].pk,
+                    nss=row.get('NSS', ''),
+                    plan_estudio_id=plan_estudio.pk if plan_estudio else None,
+                    semestre_actual=1,
+                    estatus='ACTIVO'
+                ))
+
+            if nuevos_alumnos:
+                Alumno.objects.bulk_create(nuevos_alumnos, batch_size=500, ignore_conflicts=True)
+                total_creados += len(nuevos_alumnos)
+                alumnos_cache.update({
+                    a.matricula: a
+                    for a in Alumno.objects.filter(
+                        matricula__in=[a.matricula for a in nuevos_alumnos]
+                    )
+                })
+
+    if total_creados:
+        logger.log_progress(total_creados, len(df_alumnos), "Alumnos creados")
     
     # Resumen final
     logger.log("\n   " + "-"*60)
@@ -662,52 +814,68 @@ def importar_relaciones_inscritos(df_inscritos, alumnos_cache, grupos_cache):
     alumnos_no_encontrados = set()
     grupos_no_encontrados = set()
     
-    with transaction.atomic():
-        for idx, row in df_inscritos.iterrows():
-            try:
-                matricula = limpiar_texto(row.get('Matrícula'))
-                grupo_clave = limpiar_texto(row.get('Grupo'))
-                programa_nombre = limpiar_texto(row.get('Programa'))
-                cuatrimestre_str = limpiar_texto(row.get('Cuatrimestre'))
-                
-                cache_key = (programa_nombre, cuatrimestre_str, grupo_clave)
-                
-                if not matricula or not all(cache_key):
-                    total_omitidos += 1
-                    continue
-                
-                alumno = alumnos_cache.get(matricula)
-                grupo = grupos_cache.get(cache_key)
-                
-                if not alumno:
-                    alumnos_no_encontrados.add(matricula)
-                    errores += 1
-                    continue
-                
-                if not grupo:
-                    grupos_no_encontrados.add(str(cache_key))
-                    errores += 1
-                    continue
-                
-                relacion, created = AlumnoGrupo.objects.get_or_create(
-                    alumno=alumno,
-                    grupo=grupo,
-                    defaults={
-                        'fecha_inscripcion': date.today(),
-                        'activo': 1  # Cambio: usar 1 en lugar de True
-                    }
-                )
-                
-                if created:
-                    total_creados += 1
-                    # Mostrar progreso cada 500
-                    if total_creados % 500 == 0:
-                        logger.log_progress(total_creados, len(df_inscritos), "Relaciones creadas")
-                
-            except Exception as e:
-                errores += 1
-                error_msg = f"Fila {idx+2} (Matrícula: {matricula if 'matricula' in locals() else 'N/A'}): {str(e)}"
-                logger.log_error(error_msg, SECCION)
+    # Limpieza vectorizada de la hoja de inscritos antes del loop
+    limpiar_columnas(df_inscritos, ['Matrícula', 'Grupo', 'Programa', 'Cuatrimestre'])
+
+    # 1. Resolver pares (alumno, grupo) en memoria, fuera de transaccion
+    pares = set()
+    for idx, row in enumerate(df_inscritos.to_dict('records')):
+        matricula = row.get('Matrícula')
+        grupo_clave = row.get('Grupo')
+        programa_nombre = row.get('Programa')
+        cuatrimestre_str = row.get('Cuatrimestre')
+
+        cache_key = clave_grupo(programa_nombre, cuatrimestre_str, grupo_clave)
+
+        if not matricula or not all(cache_key):
+            total_omitidos += 1
+            continue
+
+        alumno = alumnos_cache.get(matricula)
+        grupo = grupos_cache.get(cache_key)
+
+        if not alumno:
+            alumnos_no_encontrados.add(matricula)
+            errores += 1
+            continue
+
+        if not grupo:
+            grupos_no_encontrados.add(str(cache_key))
+            errores += 1
+            continue
+
+        pares.add((alumno.id, grupo.id))
+
+    # 2. Una sola query por las relaciones ya existentes y bulk_create de
+    # las nuevas confirmado por bloques — sin get_or_create por fila
+    existentes = set(
+        AlumnoGrupo.objects.filter(
+            alumno_id__in={alumno_id for alumno_id, _ in pares}
+        ).values_list('alumno_id', 'grupo_id')
+    )
+
+    nuevas_relaciones = [
+        AlumnoGrupo(
+            alumno_id=alumno_id,
+            grupo_id=grupo_id,
+            fecha_inscripcion=date.today(),
+            activo=1  # Cambio: usar 1 en lugar de True
+        )
+        for alumno_id, grupo_id in pares
+        if (alumno_id, grupo_id) not in existentes
+    ]
+
+    # AlumnoGrupo es una tabla plana de cuatro columnas: lotes mas grandes
+    # reducen roundtrips sin riesgo de paquetes excesivos en MySQL
+    for bloque in en_bloques(nuevas_relaciones):
+        with transaction.atomic():
+            AlumnoGrupo.objects.bulk_create(
+                bloque, batch_size=1000, ignore_conflicts=True
+            )
+        total_creados += len(bloque)
+
+    if total_creados:
+        logger.log_progress(total_creados, len(df_inscritos), "Relaciones creadas")
 
     # Resumen final detallado
     logger.log("\n   " + "-"*60)
@@ -775,13 +943,20 @@ def generar_reporte_bajas(periodo_actual, matriculas_nuevas):
         
         # Guardar detalles en archivo
         if alumnos_baja:
+            # Un solo query con los users incluidos y solo las columnas
+            # que usa el reporte, en lugar de dos queries por alumno
+            alumnos_por_matricula = Alumno.objects.select_related('user').only(
+                'matricula',
+                'user__nombre_completo', 'user__first_name', 'user__last_name'
+            ).filter(matricula__in=alumnos_baja).in_bulk(field_name='matricula')
+
             with open('alumnos_dados_de_baja.txt', 'w', encoding='utf-8') as f:
                 f.write(f"ALUMNOS DADOS DE BAJA - {periodo_anterior.codigo} → {periodo_actual.codigo}\n")
                 f.write(f"{'='*70}\n\n")
                 f.write(f"Total: {len(alumnos_baja)} alumnos\n\n")
                 f.write("Matrículas:\n")
                 for matricula in sorted(alumnos_baja):
-                    alumno = Alumno.objects.filter(matricula=matricula).first()
+                    alumno = alumnos_por_matricula.get(matricula)
                     if alumno:
                         nombre = alumno.user.nombre_completo or alumno.user.get_full_name()
                         f.write(f"  - {matricula}: {nombre}\n")
@@ -844,28 +1019,33 @@ def main():
         def leer_hoja_inteligente(excel_file, nombre_hoja):
             if not nombre_hoja:
                 return pd.DataFrame()
-            
-            df_preview = pd.read_excel(excel_file, sheet_name=nombre_hoja, nrows=10)
-            
+
+            # Una sola lectura de la hoja (un solo pase de XML): el header
+            # se detecta sobre el DataFrame crudo en lugar de releer la
+            # hoja por cada fila candidata. dtype=str evita la inferencia
+            # de tipos de pandas (y el viaje numero -> float -> str en
+            # matriculas/claves); keep_default_na entrega '' en celdas
+            # vacias, que limpiar_columna normaliza a None
+            df_raw = pd.read_excel(
+                excel_file, sheet_name=nombre_hoja, header=None,
+                dtype=str, keep_default_na=False
+            )
+            if df_raw.empty:
+                return pd.DataFrame()
+
             header_row = 0
-            for i in range(10):
-                try:
-                    df_test = pd.read_excel(excel_file, sheet_name=nombre_hoja, header=i, nrows=1)
-                    cols_str = ' '.join(str(col).lower() for col in df_test.columns)
-                    
-                    if 'matricula' in cols_str or 'matrícula' in cols_str:
-                        header_row = i
-                        break
-                    elif 'empleado' in cols_str or 'nombres' in cols_str:
-                        header_row = i
-                        break
-                    elif 'grupo' in cols_str or 'cuatrimestre' in cols_str:
-                        header_row = i
-                        break
-                except:
-                    continue
-            
-            df = pd.read_excel(excel_file, sheet_name=nombre_hoja, header=header_row)
+            claves_header = (
+                'matricula', 'matrícula', 'empleado', 'nombres',
+                'grupo', 'cuatrimestre'
+            )
+            for i in range(min(10, len(df_raw))):
+                fila_str = ' '.join(str(celda).lower() for celda in df_raw.iloc[i])
+                if any(clave in fila_str for clave in claves_header):
+                    header_row = i
+                    break
+
+            df = df_raw.iloc[header_row + 1:].reset_index(drop=True)
+            df.columns = list(df_raw.iloc[header_row])
             logger.log_info(f"Hoja '{nombre_hoja}': Header detectado en fila {header_row + 1}")
             logger.log(f"      Columnas: {list(df.columns)[:5]}...")
             return df
@@ -874,6 +1054,15 @@ def main():
         df_grupos = leer_hoja_inteligente(excel_file, hojas_map['grupos'])
         df_tutores = leer_hoja_inteligente(excel_file, hojas_map['tutores'])
         df_inscritos = leer_hoja_inteligente(excel_file, hojas_map['inscritos'])
+
+        # Dedupe a nivel DataFrame (una pasada en C): evita que las filas
+        # repetidas del Excel lleguen a los loops de importación
+        df_alumnos = deduplicar_hoja(df_alumnos, ['Matrícula'])
+        df_tutores = deduplicar_hoja(df_tutores, ['No. de empleado'])
+        df_grupos = deduplicar_hoja(df_grupos, ['Programa', 'Cuatrimestre', 'Grupo'])
+        df_inscritos = deduplicar_hoja(
+            df_inscritos, ['Matrícula', 'Programa', 'Cuatrimestre', 'Grupo']
+        )
         
         # =====================================================================
         # GESTIÓN DE PERIODOS (NUEVO)
@@ -884,15 +1073,22 @@ def main():
         # =====================================================================
         # IMPORTAR EN ORDEN
         # =====================================================================
+        # connection.close() entre hojas suelta la conexión (y su estado
+        # acumulado); Django reconecta perezosamente en la siguiente query
         divisiones_cache, programas_cache = importar_divisiones_programas(df_alumnos, df_grupos)
+        connection.close()
         tutores_cache = importar_tutores(df_tutores, divisiones_cache) if not df_tutores.empty else {}
+        connection.close()
         grupos_cache = importar_grupos(df_grupos, programas_cache, tutores_cache, periodo) if not df_grupos.empty else {}
+        connection.close()
         alumnos_cache = importar_alumnos(df_alumnos, programas_cache) if not df_alumnos.empty else {}
-        
+        connection.close()
+
         matriculas_importadas = set(alumnos_cache.keys())
-        
+
         if not df_inscritos.empty:
             importar_relaciones_inscritos(df_inscritos, alumnos_cache, grupos_cache)
+            connection.close()
         
         # =====================================================================
         # REPORTE DE BAJAS (NUEVO)